@@ -8,6 +8,7 @@ The application serves as the main entry point for all backend API endpoints.
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
+from flask_compress import Compress
 from dotenv import load_dotenv
 import os
 from pathlib import Path
@@ -25,7 +26,8 @@ from routes import (
 from database import init_db
 from utils.logger import get_logger, log_request
 from utils.exceptions import APIError, get_error_response
-from datetime import datetime
+from utils.json_provider import ORJSONProvider
+import time
 
 # Load environment variables from .env file
 # Look in both server/ directory and parent (root) directory
@@ -37,8 +39,13 @@ init_db()
 
 # Initialize Flask application
 app = Flask(__name__)
+app.json = ORJSONProvider(app)  # Fast serialization for transcript-heavy payloads
 CORS(app)  # Enable CORS for all routes
 
+# Compress JSON responses (transcripts and video payloads dominate bandwidth)
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+Compress(app)
+
 # Get logger
 logger = get_logger(__name__)
 
@@ -143,7 +150,7 @@ def handle_unexpected_error(error):
 def log_request_info():
     """Log incoming requests."""
     # Store request start time for duration calculation
-    request.start_time = datetime.utcnow()
+    request.start_time = time.perf_counter()
 
 
 @app.after_request
@@ -151,8 +158,7 @@ def log_response_info(response):
     """Log outgoing responses with duration."""
     # Calculate request duration
     if hasattr(request, 'start_time'):
-        duration = (datetime.utcnow() - request.start_time).total_seconds() * 1000
-        duration_ms = int(duration)
+        duration_ms = int((time.perf_counter() - request.start_time) * 1000)
     else:
         duration_ms = None
 
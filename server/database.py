@@ -8,6 +8,8 @@ and provides a SessionLocal class for creating database sessions.
 The database can be configured via environment variables:
     DATABASE_URL: Database connection string (default: SQLite)
     SQL_ECHO: Whether to log SQL queries (default: True)
+    DB_POOL_SIZE: Persistent connections kept in the pool (default: 20)
+    DB_MAX_OVERFLOW: Extra connections allowed under burst load (default: 40)
 
 Usage:
     from database import SessionLocal
@@ -32,12 +34,27 @@ load_dotenv()
 # Get database configuration from environment variables
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./learnflow.db")
 SQL_ECHO = os.getenv("SQL_ECHO", "True").lower() in ("true", "1", "yes")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 40))
+
+# Connection pool settings for server databases. SQLite picks its own pool
+# class, which doesn't accept sizing arguments.
+pool_options = {}
+if not DATABASE_URL.startswith("sqlite"):
+    pool_options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": 1800,  # Replace connections before server-side idle timeouts
+        "pool_use_lifo": True,  # Reuse warm connections, let idle ones expire
+    }
 
 # Create database engine with configuration
 engine = create_engine(
     DATABASE_URL,
     echo=SQL_ECHO,  # Log SQL queries for debugging
     future=True,  # Use SQLAlchemy 2.0 style
+    pool_pre_ping=True,  # Detect connections dropped by DB restarts/failovers
+    **pool_options,
 )
 
 # Create session factory for database operations
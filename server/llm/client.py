@@ -5,10 +5,23 @@ Can be switched back to Gemini by changing LLM_PROVIDER env var.
 """
 
 import os
-from openai import OpenAI
+import threading
 from prompts.system import system_instructions
 
 
+def _prompt_cache_options(cache_key):
+    """
+    Build the OpenAI prompt caching arguments for a request.
+
+    Args:
+        cache_key (str or None): Prompt cache routing key
+
+    Returns:
+        dict: Extra keyword arguments for chat.completions.create
+    """
+    return {"prompt_cache_key": cache_key} if cache_key else {}
+
+
 class OpenAIClient:
     """
     Client for interacting with OpenAI's GPT models.
@@ -22,6 +35,10 @@ class OpenAIClient:
         Raises:
             ValueError: If required environment variables are not set
         """
+        # Imported here (like genai below): the SDK takes ~0.5s to import and
+        # isn't needed until the first LLM request
+        from openai import OpenAI
+
         self.api_key = os.environ.get("OPENAI_API_KEY")
         self.model_name = os.environ.get("OPENAI_MODEL_NAME", "gpt-4o-mini")
 
@@ -38,6 +55,7 @@ class OpenAIClient:
         prompt,
         system_instruction=None,
         temperature=0.7,
+        cache_key=None,
         **kwargs
     ):
         """
@@ -48,6 +66,8 @@ class OpenAIClient:
             system_instruction (str, optional): System instruction for model
                 If None, uses default LearnFlow system instructions
             temperature (float): Temperature for generation (default: 0.7)
+            cache_key (str, optional): Routing key for OpenAI prompt caching.
+                Requests sharing a key and prompt prefix reuse cached prefill.
             **kwargs: Additional configuration parameters
 
         Returns:
@@ -68,7 +88,8 @@ class OpenAIClient:
         response = self.client.chat.completions.create(
             model=self.model_name,
             messages=messages,
-            temperature=temperature
+            temperature=temperature,
+            **_prompt_cache_options(cache_key)
         )
 
         return response.choices[0].message.content
@@ -78,6 +99,7 @@ class OpenAIClient:
         prompt,
         system_instruction=None,
         temperature=0.7,
+        cache_key=None,
         **kwargs
     ):
         """
@@ -88,6 +110,8 @@ class OpenAIClient:
             system_instruction (str, optional): System instruction for model
                 If None, uses default LearnFlow system instructions
             temperature (float): Temperature for generation (default: 0.7)
+            cache_key (str, optional): Routing key for OpenAI prompt caching.
+                Requests sharing a key and prompt prefix reuse cached prefill.
             **kwargs: Additional configuration parameters
 
         Yields:
@@ -109,12 +133,17 @@ class OpenAIClient:
             model=self.model_name,
             messages=messages,
             temperature=temperature,
-            stream=True
+            stream=True,
+            **_prompt_cache_options(cache_key)
         )
 
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        try:
+            for chunk in stream:
+                if chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Release the HTTP connection if the caller stops reading early
+            stream.close()
 
 
 # Keep Gemini client for easy switching back
@@ -149,9 +178,15 @@ class LearnLMClient:
         prompt,
         system_instruction=None,
         temperature=0.7,
+        cache_key=None,
         **kwargs
     ):
-        """Generate content from LearnLM (non-streaming)."""
+        """
+        Generate content from LearnLM (non-streaming).
+
+        cache_key is accepted for interface parity with OpenAIClient; Gemini
+        caches repeated prompt prefixes implicitly.
+        """
         from google.genai import types
 
         contents = [
@@ -183,9 +218,14 @@ class LearnLMClient:
         prompt,
         system_instruction=None,
         temperature=0.7,
+        cache_key=None,
         **kwargs
     ):
-        """Generate streaming content from LearnLM."""
+        """
+        Generate streaming content from LearnLM.
+
+        cache_key is accepted for interface parity with OpenAIClient.
+        """
         from google.genai import types
 
         contents = [
@@ -213,8 +253,10 @@ class LearnLMClient:
                 yield chunk.text
 
 
-# Singleton instance
+# Singleton instance; the lock keeps concurrent first requests from each
+# building their own SDK client and connection pool
 _client_instance = None
+_client_lock = threading.Lock()
 
 
 def get_client():
@@ -234,11 +276,13 @@ def get_client():
     global _client_instance
 
     if _client_instance is None:
-        provider = os.environ.get("LLM_PROVIDER", "openai").lower()
-
-        if provider == "gemini":
-            _client_instance = LearnLMClient()
-        else:
-            _client_instance = OpenAIClient()
+        with _client_lock:
+            if _client_instance is None:
+                provider = os.environ.get("LLM_PROVIDER", "openai").lower()
+
+                if provider == "gemini":
+                    _client_instance = LearnLMClient()
+                else:
+                    _client_instance = OpenAIClient()
 
     return _client_instance
@@ -160,6 +160,15 @@ class UserVideoProgress(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "video_id", name="uq_user_video_progress"),
         Index("ix_user_video_progress_last_watched_at", "last_watched_at"),
+        # Serves the per-user watch history, newest first. On PostgreSQL it
+        # also carries the progress columns so per-user listings are
+        # index-only scans.
+        Index(
+            "ix_user_video_progress_user_last_watched",
+            "user_id",
+            "last_watched_at",
+            postgresql_include=["video_id", "last_position_seconds", "is_completed", "watch_count"],
+        ),
     )
 
     def __repr__(self):
@@ -324,6 +333,11 @@ class UserQuizAttempt(Base):
     user = relationship("User", back_populates="quiz_attempts")
     quiz = relationship("Quiz", back_populates="attempts")
 
+    __table_args__ = (
+        # Serves a user's attempt history for a video's quizzes
+        Index("ix_user_quiz_attempts_user_quiz_submitted", "user_id", "quiz_id", "submitted_at"),
+    )
+
     def __repr__(self):
         return (
             f"<UserQuizAttempt user_id={self.user_id} "
@@ -365,6 +379,11 @@ class ChatMessage(Base):
     user = relationship("User", back_populates="chat_messages")
     video = relationship("Video", back_populates="chat_messages")
 
+    __table_args__ = (
+        # Serves the newest-first history lookup without a sort
+        Index("ix_chat_video_user_created", "video_id", "user_id", "created_at"),
+    )
+
     def __repr__(self):
         return (
             f"<ChatMessage id={self.id} user_id={self.user_id} role={self.role}>"
@@ -3,12 +3,14 @@ Chat interface routes for LearnFlow AI tutor.
 Handles chat message sending, streaming, and history retrieval.
 """
 
+from datetime import datetime, timezone
 from flask import Blueprint, request, jsonify, Response, g
 from database import SessionLocal
 from services import (
     generate_chat_response,
     generate_chat_response_stream,
     save_chat_message,
+    save_chat_messages,
     get_chat_history,
     generate_session_id
 )
@@ -24,6 +26,23 @@ logger = get_logger(__name__)
 chat_bp = Blueprint('chat', __name__, url_prefix='/api/llm')
 
 
+def _save_chat_turn(messages):
+    """
+    Persist a chat turn after its response has been sent.
+
+    Runs from the response's close callback, after the route's own session
+    is closed, so it writes through a short-lived session. Failures are
+    logged rather than raised since the client already has its reply.
+
+    Args:
+        messages (list): Message dicts accepted by save_chat_messages
+    """
+    try:
+        save_chat_messages(messages)
+    except Exception as e:
+        logger.error(f"Failed to save chat turn: {str(e)}", exc_info=True)
+
+
 @chat_bp.route('/chat/send', methods=['POST'])
 @auth_required
 @rate_limit(max_requests=10, window_seconds=60, scope='user')
@@ -89,30 +108,21 @@ def chat_route():
         if not firebase_uid:
             return jsonify({'error': 'Unauthorized: Firebase UID not found'}), 401
         
-        user = db.query(User).filter_by(firebase_uid=firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter_by(firebase_uid=firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User profile not found. Please complete onboarding.'}), 404
-        
-        user_id = user.id
 
-        # Get or create video
-        video = db.query(Video).filter_by(youtube_video_id=video_youtube_id).first()
-        if not video:
+        # Look up the video's id (skip loading its cached transcript/content)
+        video_id = db.query(Video.id).filter_by(youtube_video_id=video_youtube_id).scalar()
+        if video_id is None:
             return jsonify({'error': 'Video not found'}), 404
 
         # Generate session ID if not provided
         if not session_id:
             session_id = generate_session_id()
 
-        # Save user message
-        save_chat_message(
-            user_id=user_id,
-            video_id=video.id,
-            role='user',
-            message=message,
-            session_id=session_id,
-            timestamp_context=timestamp
-        )
+        # Timestamp the user message on arrival, ahead of the reply
+        received_at = datetime.now(timezone.utc)
 
         # Generate chat response
         response = generate_chat_response(
@@ -121,20 +131,25 @@ def chat_route():
             timestamp=timestamp
         )
 
-        # Save assistant response
-        save_chat_message(
-            user_id=user_id,
-            video_id=video.id,
-            role='assistant',
-            message=response['response'],
-            session_id=session_id,
-            timestamp_context=timestamp
-        )
-
         # Add session ID to response
         response['sessionId'] = session_id
+        http_response = jsonify(response)
+
+        # Save both sides of the turn in one transaction once the reply
+        # has been sent, keeping the commit off the request's critical path
+        turn = {
+            'user_id': user_id,
+            'video_id': video_id,
+            'session_id': session_id,
+            'timestamp_context': timestamp
+        }
+        messages = [
+            {**turn, 'role': 'user', 'message': message, 'created_at': received_at},
+            {**turn, 'role': 'assistant', 'message': response['response']}
+        ]
+        http_response.call_on_close(lambda: _save_chat_turn(messages))
 
-        return jsonify(response), 200
+        return http_response, 200
 
     except ValueError as e:
         # ValueError messages are safe to expose (validation errors only)
@@ -194,15 +209,13 @@ def chat_stream_route():
         if not firebase_uid:
             return jsonify({'error': 'Unauthorized: Firebase UID not found'}), 401
         
-        user = db.query(User).filter_by(firebase_uid=firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter_by(firebase_uid=firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User profile not found. Please complete onboarding.'}), 404
-        
-        user_id = user.id
 
-        # Get video
-        video = db.query(Video).filter_by(youtube_video_id=video_youtube_id).first()
-        if not video:
+        # Look up the video's id (skip loading its cached transcript/content)
+        video_id = db.query(Video.id).filter_by(youtube_video_id=video_youtube_id).scalar()
+        if video_id is None:
             return jsonify({'error': 'Video not found'}), 404
 
         # Generate session ID if not provided
@@ -212,11 +225,12 @@ def chat_stream_route():
         # Save user message
         save_chat_message(
             user_id=user_id,
-            video_id=video.id,
+            video_id=video_id,
             role='user',
             message=message,
             session_id=session_id,
-            timestamp_context=timestamp
+            timestamp_context=timestamp,
+            db=db
         )
 
         # Generate streaming response and collect it
@@ -238,7 +252,7 @@ def chat_stream_route():
                 if full_response:
                     save_chat_message(
                         user_id=user_id,
-                        video_id=video.id,
+                        video_id=video_id,
                         role='assistant',
                         message=''.join(full_response),
                         session_id=session_id,
@@ -253,7 +267,7 @@ def chat_stream_route():
                 try:
                     save_chat_message(
                         user_id=user_id,
-                        video_id=video.id,
+                        video_id=video_id,
                         role='assistant',
                         message=error_message,
                         session_id=session_id,
@@ -331,22 +345,21 @@ def get_chat_history_route(video_id):
         if not firebase_uid:
             return jsonify({'error': 'Unauthorized: Firebase UID not found'}), 401
         
-        user = db.query(User).filter_by(firebase_uid=firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter_by(firebase_uid=firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User profile not found. Please complete onboarding.'}), 404
-        
-        user_id = user.id
-        
-        # Get video
-        video = db.query(Video).filter_by(youtube_video_id=video_id).first()
-        if not video:
+
+        # Look up the video's id (skip loading its cached transcript/content)
+        video_db_id = db.query(Video.id).filter_by(youtube_video_id=video_id).scalar()
+        if video_db_id is None:
             return jsonify({'error': 'Video not found'}), 404
         
         # Get chat history
         messages = get_chat_history(
-            video_id=video.id,
+            video_id=video_db_id,
             user_id=user_id,
-            limit=limit
+            limit=limit,
+            db=db
         )
         
         return jsonify({
@@ -7,9 +7,11 @@ import json
 import traceback
 from datetime import datetime, timezone
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy import and_, func
 from database import SessionLocal
 from models import Checkpoint, UserCheckpointCompletion, User, Video
 from middleware.auth import auth_required
+from utils.db_upsert import dialect_insert
 from utils.logger import get_logger
 
 # Configure logging
@@ -19,6 +21,80 @@ logger = get_logger(__name__)
 checkpoint_progress_bp = Blueprint('checkpoint_progress', __name__, url_prefix='/api/llm')
 
 
+def _record_checkpoint_attempt(db, user_id, checkpoint_id, is_correct):
+    """
+    Count one attempt at a checkpoint, creating the completion row if needed.
+
+    On backends with native upsert this is a single INSERT ... ON CONFLICT
+    DO UPDATE ... RETURNING, so concurrent attempts can't race between the
+    lookup and the insert. Other backends fall back to the ORM.
+
+    Args:
+        db: Database session
+        user_id (int): User ID
+        checkpoint_id (int): Checkpoint ID
+        is_correct (bool): Whether this attempt answered correctly
+
+    Returns:
+        Row or UserCheckpointCompletion with id, is_completed, attempt_count
+        and completed_at. The caller commits.
+    """
+    now = datetime.now(timezone.utc)
+    upsert = dialect_insert(db, UserCheckpointCompletion)
+
+    if upsert is None:
+        completion = db.query(UserCheckpointCompletion).filter_by(
+            user_id=user_id,
+            checkpoint_id=checkpoint_id
+        ).first()
+
+        if completion:
+            completion.attempt_count += 1
+            if is_correct and not completion.is_completed:
+                completion.is_completed = True
+                completion.completed_at = now
+        else:
+            completion = UserCheckpointCompletion(
+                user_id=user_id,
+                checkpoint_id=checkpoint_id,
+                is_completed=is_correct,
+                completed_at=now if is_correct else None,
+                attempt_count=1
+            )
+            db.add(completion)
+        db.flush()
+        return completion
+
+    table = UserCheckpointCompletion.__table__
+    updates = {'attempt_count': table.c.attempt_count + 1}
+    if is_correct:
+        # Keep the time of the first correct answer
+        updates['is_completed'] = True
+        updates['completed_at'] = func.coalesce(table.c.completed_at, now)
+
+    stmt = (
+        upsert
+        .values(
+            user_id=user_id,
+            checkpoint_id=checkpoint_id,
+            is_completed=is_correct,
+            completed_at=now if is_correct else None,
+            attempt_count=1
+        )
+        .on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.checkpoint_id],
+            set_=updates
+        )
+        .returning(
+            UserCheckpointCompletion.id,
+            UserCheckpointCompletion.is_completed,
+            UserCheckpointCompletion.attempt_count,
+            UserCheckpointCompletion.completed_at
+        )
+    )
+    return db.execute(stmt).one()
+
+
 @checkpoint_progress_bp.route('/checkpoints/<int:checkpoint_id>/complete', methods=['POST'])
 @auth_required
 def mark_checkpoint_complete(checkpoint_id):
@@ -64,8 +140,8 @@ def mark_checkpoint_complete(checkpoint_id):
     db = SessionLocal()
     try:
         # Look up user by Firebase UID
-        user = db.query(User).filter_by(firebase_uid=firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter_by(firebase_uid=firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User not found'}), 404
 
         # Verify checkpoint exists
@@ -85,31 +161,8 @@ def mark_checkpoint_complete(checkpoint_id):
         correct_answer = question_data.get('correctAnswer')
         is_correct = (selected_answer == correct_answer) if correct_answer and selected_answer is not None else False
 
-        # Check if completion record exists
-        completion = db.query(UserCheckpointCompletion).filter_by(
-            user_id=user.id,
-            checkpoint_id=checkpoint_id
-        ).first()
-
-        if completion:
-            # Update existing record
-            completion.attempt_count += 1
-            if is_correct and not completion.is_completed:
-                completion.is_completed = True
-                completion.completed_at = datetime.now(timezone.utc)
-        else:
-            # Create new completion record
-            completion = UserCheckpointCompletion(
-                user_id=user.id,
-                checkpoint_id=checkpoint_id,
-                is_completed=is_correct,
-                completed_at=datetime.now(timezone.utc) if is_correct else None,
-                attempt_count=1
-            )
-            db.add(completion)
-
+        completion = _record_checkpoint_attempt(db, user_id, checkpoint_id, is_correct)
         db.commit()
-        db.refresh(completion)
 
         return jsonify({
             'completionId': completion.id,
@@ -166,18 +219,33 @@ def get_checkpoint_progress(video_id):
     db = SessionLocal()
     try:
         # Look up user by Firebase UID
-        user = db.query(User).filter_by(firebase_uid=firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter_by(firebase_uid=firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User not found'}), 404
 
-        # Verify video exists
-        video = db.query(Video).filter_by(id=video_id).first()
+        # Verify video exists (id only; skip the large cached-content columns)
+        video = db.query(Video.id).filter_by(id=video_id).first()
         if not video:
             return jsonify({'error': 'Video not found'}), 404
 
-        # Get all checkpoints for this video
-        checkpoints = db.query(Checkpoint).filter_by(video_id=video_id).all()
-        total_checkpoints = len(checkpoints)
+        # Fetch every checkpoint for this video with the user's completion
+        # record (if any) in one round trip
+        rows = db.query(
+            Checkpoint.id,
+            UserCheckpointCompletion.is_completed,
+            UserCheckpointCompletion.attempt_count,
+            UserCheckpointCompletion.completed_at
+        ).outerjoin(
+            UserCheckpointCompletion,
+            and_(
+                UserCheckpointCompletion.checkpoint_id == Checkpoint.id,
+                UserCheckpointCompletion.user_id == user_id
+            )
+        ).filter(
+            Checkpoint.video_id == video_id
+        ).order_by(Checkpoint.id).all()
+
+        total_checkpoints = len(rows)
 
         if total_checkpoints == 0:
             return jsonify({
@@ -188,30 +256,21 @@ def get_checkpoint_progress(video_id):
                 'completions': []
             }), 200
 
-        # Get completion records for this user
-        completions = db.query(UserCheckpointCompletion).filter(
-            UserCheckpointCompletion.user_id == user.id,
-            UserCheckpointCompletion.checkpoint_id.in_([c.id for c in checkpoints])
-        ).all()
-
-        # Build completion map
-        completion_map = {c.checkpoint_id: c for c in completions}
+        # Build response
+        completion_data = [
+            {
+                'checkpointId': checkpoint_id,
+                'isCompleted': bool(is_completed),
+                'attemptCount': attempt_count or 0,
+                'completedAt': completed_at.isoformat() if completed_at else None
+            }
+            for checkpoint_id, is_completed, attempt_count, completed_at in rows
+        ]
 
         # Count completed checkpoints
-        completed_count = sum(1 for c in completions if c.is_completed)
+        completed_count = sum(1 for c in completion_data if c['isCompleted'])
         progress_percentage = (completed_count / total_checkpoints * 100)
 
-        # Build response
-        completion_data = []
-        for checkpoint in checkpoints:
-            completion = completion_map.get(checkpoint.id)
-            completion_data.append({
-                'checkpointId': checkpoint.id,
-                'isCompleted': completion.is_completed if completion else False,
-                'attemptCount': completion.attempt_count if completion else 0,
-                'completedAt': completion.completed_at.isoformat() if completion and completion.completed_at else None
-            })
-
         return jsonify({
             'videoId': video_id,
             'totalCheckpoints': total_checkpoints,
@@ -5,7 +5,7 @@ Provides common database operations for checkpoints, quizzes, and caching.
 
 import json
 from database import SessionLocal
-from services import get_video_by_youtube_id, cache_checkpoints
+from services import get_video_by_youtube_id, get_video_id_by_youtube_id, cache_checkpoints
 from models import Checkpoint, Quiz
 from utils.logger import get_logger
 
@@ -152,14 +152,14 @@ def save_quiz_to_db(video_id, quiz_data):
     """
     db = SessionLocal()
     try:
-        video = get_video_by_youtube_id(video_id, db)
-        if not video:
+        db_video_id = get_video_id_by_youtube_id(video_id, db)
+        if db_video_id is None:
             return None
 
         # Create Quiz record
         num_questions = len(quiz_data.get('questions', []))
         quiz_record = Quiz(
-            video_id=video.id,
+            video_id=db_video_id,
             title="Test Your Knowledge",
             num_questions=num_questions,
             difficulty="intermediate",  # Default, could be determined by analysis
@@ -1,10 +1,10 @@
 """
 Health check and utility routes for LLM services.
-Provides health status and cache size information.
+Provides health status and cache size/hit-rate information.
 """
 
 from flask import Blueprint, jsonify
-from utils import checkpoint_cache, quiz_cache, summary_cache
+from utils import checkpoint_cache, quiz_cache, summary_cache, video_cache, metadata_cache
 
 # Blueprint for health check routes
 health_bp = Blueprint('health', __name__, url_prefix='/api/llm')
@@ -16,11 +16,26 @@ def health_check():
     Health check endpoint for LLM routes.
 
     Returns:
-        {"status": "ok", "cacheSize": 3}
+        {
+            "status": "ok",
+            "checkpointCacheSize": 3,
+            ...
+            "cacheStats": {
+                "video": {"size": 3, "hits": 40, "misses": 5, "hitRate": 0.8889},
+                ...
+            }
+        }
     """
     return jsonify({
         'status': 'ok',
         'checkpointCacheSize': checkpoint_cache.size(),
         'quizCacheSize': quiz_cache.size(),
-        'summaryCacheSize': summary_cache.size()
+        'summaryCacheSize': summary_cache.size(),
+        'cacheStats': {
+            'checkpoint': checkpoint_cache.stats(),
+            'quiz': quiz_cache.stats(),
+            'summary': summary_cache.stats(),
+            'video': video_cache.stats(),
+            'metadata': metadata_cache.stats()
+        }
     }), 200
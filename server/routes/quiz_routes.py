@@ -11,7 +11,7 @@ from flask import Blueprint, request, jsonify, g
 from database import SessionLocal
 from services import (
     generate_quiz,
-    get_video_by_youtube_id
+    get_video_id_by_youtube_id
 )
 from utils import quiz_cache
 from utils.logger import get_logger
@@ -197,11 +197,11 @@ def clear_quiz_cache():
             db = SessionLocal()
             try:
                 # Find video by YouTube ID
-                video = get_video_by_youtube_id(video_id, db)
-                if video:
+                db_video_id = get_video_id_by_youtube_id(video_id, db)
+                if db_video_id is not None:
                     # Safe approach: Check for existing quiz attempts before deleting
                     # to avoid foreign key constraint violations
-                    quiz_records = db.query(Quiz).filter_by(video_id=video.id).all()
+                    quiz_records = db.query(Quiz).filter_by(video_id=db_video_id).all()
                     quiz_ids_to_delete = [q.id for q in quiz_records]
                     
                     # Check if any UserQuizAttempts reference these quizzes
@@ -213,11 +213,11 @@ def clear_quiz_cache():
                         # Soft delete: Add a deleted/active flag to Quiz model in future
                         # For now, we'll clear the quiz cache but let the generation 
                         # service create a new quiz rather than deleting existing ones
-                        logger.info(f"Skipping quiz deletion for video {video.id} due to existing attempts")
+                        logger.info(f"Skipping quiz deletion for video {db_video_id} due to existing attempts")
                         db_cleared = False  # Memory cache cleared but DB records preserved
                     else:
                         # Safe to delete - no attempts reference these quizzes
-                        db.query(Quiz).filter_by(video_id=video.id).delete()
+                        db.query(Quiz).filter_by(video_id=db_video_id).delete()
                         db.commit()
                         db_cleared = True
             except Exception as e:
@@ -296,8 +296,8 @@ def submit_quiz():
     db = SessionLocal()
     try:
         # Look up user by Firebase UID
-        user = db.query(User).filter_by(firebase_uid=firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter_by(firebase_uid=firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User not found'}), 404
 
         # Verify quiz exists
@@ -340,7 +340,7 @@ def submit_quiz():
 
         # Create quiz attempt record
         attempt = UserQuizAttempt(
-            user_id=user.id,
+            user_id=user_id,
             quiz_id=quiz_id,
             score=score,
             answers=json.dumps(answers),
@@ -418,27 +418,43 @@ def get_quiz_attempts():
     try:
         # Get authenticated user
         firebase_uid = g.firebase_user.get('uid')
-        user = db.query(User).filter_by(firebase_uid=firebase_uid).first()
+        user_id = db.query(User.id).filter_by(firebase_uid=firebase_uid).scalar()
         
-        if not user:
+        if user_id is None:
             return jsonify({'error': 'User not found'}), 404
         
         # Get video by YouTube ID
-        video = get_video_by_youtube_id(video_id, db)
+        db_video_id = get_video_id_by_youtube_id(video_id, db)
         
-        if not video:
+        if db_video_id is None:
             return jsonify({'error': 'Video not found'}), 404
         
-        # Get all quizzes for this video
-        quizzes = db.query(Quiz).filter_by(video_id=video.id).all()
+        # Get all quizzes for this video, parsing each quiz's questions once
+        # rather than once per attempt
+        quizzes = db.query(
+            Quiz.id, Quiz.questions_data, Quiz.num_questions
+        ).filter_by(video_id=db_video_id).all()
         quiz_ids = [q.id for q in quizzes]
-        
-        # Create quiz lookup dictionary to avoid N+1 queries
-        quiz_map = {q.id: q for q in quizzes}
+
+        # Quiz id -> (parsed questions or None, question count)
+        quiz_questions = {}
+        for quiz in quizzes:
+            questions = None
+            total_questions = 0
+            if quiz.questions_data:
+                try:
+                    questions = json.loads(quiz.questions_data)
+                    total_questions = len(questions)
+                except (json.JSONDecodeError, TypeError) as e:
+                    # Fallback to num_questions if questions_data is corrupted
+                    # Note: This may not match actual questions if data is inconsistent
+                    total_questions = quiz.num_questions or 0
+                    print(f"Warning: Failed to parse questions_data for quiz {quiz.id}: {e}")
+            quiz_questions[quiz.id] = (questions, total_questions)
         
         # Get all attempts by this user for quizzes on this video
         attempts = db.query(UserQuizAttempt).filter(
-            UserQuizAttempt.user_id == user.id,
+            UserQuizAttempt.user_id == user_id,
             UserQuizAttempt.quiz_id.in_(quiz_ids)
         ).order_by(UserQuizAttempt.submitted_at.desc()).all()
         
@@ -447,26 +463,13 @@ def get_quiz_attempts():
         scores = []
         
         for attempt in attempts:
-            # Get the quiz from the lookup dictionary
-            quiz = quiz_map.get(attempt.quiz_id)
-            total_questions = 0
-            
-            if quiz and quiz.questions_data:
-                try:
-                    questions = json.loads(quiz.questions_data)
-                    total_questions = len(questions)
-                except (json.JSONDecodeError, TypeError) as e:
-                    # Fallback to num_questions if questions_data is corrupted
-                    # Note: This may not match actual questions if data is inconsistent
-                    total_questions = quiz.num_questions or 0
-                    print(f"Warning: Failed to parse questions_data for quiz {quiz.id}: {e}")
+            questions, total_questions = quiz_questions.get(attempt.quiz_id, (None, 0))
             
             # Calculate correct answers server-side by validating against quiz data
             correct_answers = 0
-            if attempt.answers and quiz and quiz.questions_data:
+            if attempt.answers and questions:
                 try:
                     answers = json.loads(attempt.answers)
-                    questions = json.loads(quiz.questions_data)
                     
                     # Validate using questionIndex (0-based) which matches submit_quiz format
                     for ans in answers:
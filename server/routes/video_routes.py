@@ -8,18 +8,23 @@ for various YouTube API failure modes and returns standardized JSON responses.
 All routes are prefixed with /api/videos.
 """
 
-from flask import Blueprint, request, jsonify, g
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from flask import Blueprint, Response, request, jsonify, g, current_app
 
 from services import (
     fetch_transcript,
     extract_video_id,
+    is_valid_video_id,
     get_available_transcripts,
     calculate_video_duration_from_transcript,
     get_or_create_video,
-    get_video_by_youtube_id,
     cache_transcript,
     update_video_metadata,
     get_video_with_cache,
+    serialize_video,
     fetch_youtube_metadata,
     get_user_video_history,
     save_video_to_history,
@@ -48,8 +53,87 @@ logger = get_logger(__name__)
 
 video_bp = Blueprint('video', __name__, url_prefix='/api/videos')
 
+# Shared rule options for every video route: accept a trailing slash without
+# a 308 redirect, and skip Flask's per-rule OPTIONS handler (preflight is
+# answered once in _answer_preflight below).
+ROUTE_OPTIONS = {'strict_slashes': False, 'provide_automatic_options': False}
+
+# Shared pool for outbound YouTube fetches, so requests don't pay for
+# spinning up and joining their own threads
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='youtube-fetch')
+
+# Transcript snippets serialized per chunk when streaming a transcript
+SNIPPET_CHUNK_SIZE = 500
+
+
+@video_bp.route('', methods=['OPTIONS'], **ROUTE_OPTIONS)
+@video_bp.route('/<path:path>', methods=['OPTIONS'], **ROUTE_OPTIONS)
+def _answer_preflight(path=None):
+    """Answer CORS preflight requests for video routes (CORS adds the headers)."""
+    return current_app.make_default_options_response()
+
+
+def _parse_json():
+    """
+    Parse the raw request body as JSON using orjson.
+
+    Skips Flask's pure-Python get_json() path. The body is read without
+    caching since each handler parses it exactly once.
+
+    Returns:
+        Parsed JSON value, or None if the body is empty or not valid JSON
+    """
+    try:
+        return orjson.loads(request.get_data(cache=False) or b'')
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _video_etag(video_data):
+    """
+    Build an ETag for a video payload.
+
+    Derived from the row identity and updatedAt, which every content write
+    bumps. View counting leaves updatedAt alone, so the tag is weak:
+    totalViews may differ between two responses with the same tag.
+
+    Args:
+        video_data: Payload from get_video_with_cache
+
+    Returns:
+        str: Opaque ETag value (without quotes)
+    """
+    version = f"{video_data['id']}:{video_data['createdAt']}:{video_data['updatedAt']}"
+    return hashlib.blake2b(version.encode(), digest_size=8).hexdigest()
+
+
+def _stream_transcript_json(transcript_data):
+    """
+    Serialize a transcript as JSON incrementally.
+
+    Yields the top-level fields first, then the snippets array in chunks of
+    SNIPPET_CHUNK_SIZE, so long transcripts start sending right away and
+    the full document is never held in memory as one string.
+
+    Args:
+        transcript_data: Transcript dict with a "snippets" list
+
+    Yields:
+        bytes: Consecutive pieces of one JSON object
+    """
+    fields = {key: value for key, value in transcript_data.items() if key != 'snippets'}
+    head = orjson.dumps(fields)[:-1]
+    yield head + (b',' if fields else b'') + b'"snippets":['
+
+    snippets = transcript_data['snippets']
+    for start in range(0, len(snippets), SNIPPET_CHUNK_SIZE):
+        chunk = orjson.dumps(snippets[start:start + SNIPPET_CHUNK_SIZE])[1:-1]
+        yield (b',' if start else b'') + chunk
 
-@video_bp.route('/transcript', methods=['POST'])
+    yield b']}\n'
+
+
+@video_bp.route('/transcript', methods=['POST'], **ROUTE_OPTIONS)
 def get_transcript():
     """
     Fetch transcript for a YouTube video.
@@ -82,7 +166,7 @@ def get_transcript():
         500: Internal server error
     """
     try:
-        data = request.get_json()
+        data = _parse_json()
 
         if not data:
             return jsonify({'error': 'No data provided'}), 400
@@ -117,7 +201,13 @@ def get_transcript():
         )
         transcript_data['durationSeconds'] = duration
 
-        return jsonify(transcript_data), 200
+        # The generator already yields bytes, so skip Werkzeug's per-chunk
+        # str-to-bytes encoding pass
+        return Response(
+            _stream_transcript_json(transcript_data),
+            mimetype='application/json',
+            direct_passthrough=True
+        )
 
     except TranscriptsDisabled:
         return jsonify({
@@ -154,7 +244,7 @@ def get_transcript():
         }), 500
 
 
-@video_bp.route('/transcript/available', methods=['POST'])
+@video_bp.route('/transcript/available', methods=['POST'], **ROUTE_OPTIONS)
 def list_available_transcripts():
     """
     List all available transcripts for a video.
@@ -185,7 +275,7 @@ def list_available_transcripts():
         500: Internal server error
     """
     try:
-        data = request.get_json()
+        data = _parse_json()
 
         if not data:
             return jsonify({'error': 'No data provided'}), 400
@@ -228,7 +318,7 @@ def list_available_transcripts():
         }), 500
 
 
-@video_bp.route('/extract-id', methods=['POST'])
+@video_bp.route('/extract-id', methods=['POST'], **ROUTE_OPTIONS)
 def extract_video_id_route():
     """
     Extract YouTube video ID from URL.
@@ -249,7 +339,7 @@ def extract_video_id_route():
         400: Invalid URL format
     """
     try:
-        data = request.get_json()
+        data = _parse_json()
 
         if not data:
             return jsonify({'error': 'No data provided'}), 400
@@ -278,7 +368,7 @@ def extract_video_id_route():
 
 # ========== VIDEO MANAGEMENT ROUTES (Task 1.4) ==========
 
-@video_bp.route('/<youtube_video_id>', methods=['GET'])
+@video_bp.route('/<youtube_video_id>', methods=['GET'], **ROUTE_OPTIONS)
 def get_video(youtube_video_id):
     """
     Get video with all cached data.
@@ -307,22 +397,32 @@ def get_video(youtube_video_id):
 
     Status Codes:
         200: Success
+        304: Not modified (If-None-Match matches the current ETag)
         404: Video not found
         500: Internal server error
     """
     db = SessionLocal()
     try:
-        # Validate video ID
-        if len(youtube_video_id) != 11:
+        # Validate video ID (length and charset) before touching the database
+        if not is_valid_video_id(youtube_video_id):
             return jsonify({'error': 'Invalid YouTube video ID format'}), 400
 
         # Get video with cache
         try:
             video_data = get_video_with_cache(youtube_video_id, db)
-            return jsonify(video_data), 200
         except ValueError as e:
             return jsonify({'error': str(e)}), 404
 
+        # The view is counted either way; only skip re-sending the body
+        etag = _video_etag(video_data)
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = jsonify(video_data)
+        response.set_etag(etag, weak=True)
+        response.cache_control.no_cache = True
+        return response
+
     except Exception as e:
         return jsonify({
             'error': 'Failed to get video',
@@ -332,7 +432,55 @@ def get_video(youtube_video_id):
         db.close()
 
 
-@video_bp.route('', methods=['POST'])
+def _hydrate_video(video_id, youtube_video_id, fetch_metadata, fetch_transcript_flag, language_codes):
+    """
+    Fetch and store metadata and transcript for a video outside the request.
+
+    Runs on _FETCH_EXECUTOR for background create_video requests. Failures
+    are logged; the video simply stays without that data.
+
+    Args:
+        video_id: Database video ID
+        youtube_video_id: YouTube video ID
+        fetch_metadata: Whether to fetch and store metadata
+        fetch_transcript_flag: Whether to fetch and cache the transcript
+        language_codes: Preferred transcript languages (optional)
+    """
+    db = SessionLocal()
+    try:
+        if fetch_metadata:
+            try:
+                metadata = fetch_youtube_metadata(youtube_video_id)
+                update_video_metadata(
+                    video_id,
+                    title=metadata.get('title'),
+                    description=metadata.get('description'),
+                    thumbnail_url=metadata.get('thumbnailUrl'),
+                    duration_seconds=metadata.get('durationSeconds'),
+                    db=db
+                )
+            except Exception as e:
+                db.rollback()
+                logger.warning(
+                    f"Background metadata fetch failed: {e}",
+                    extra={"video_id": youtube_video_id}
+                )
+
+        if fetch_transcript_flag:
+            try:
+                transcript_data = fetch_transcript(youtube_video_id, language_codes)
+                cache_transcript(video_id, transcript_data, db)
+            except Exception as e:
+                db.rollback()
+                logger.warning(
+                    f"Background transcript fetch failed: {e}",
+                    extra={"video_id": youtube_video_id}
+                )
+    finally:
+        db.close()
+
+
+@video_bp.route('', methods=['POST'], **ROUTE_OPTIONS)
 def create_video():
     """
     Add new video to system (with optional metadata and transcript).
@@ -342,9 +490,14 @@ def create_video():
             "videoId": "abc123" or "https://youtube.com/watch?v=abc123",
             "fetchMetadata": true,  // Optional, default false
             "fetchTranscript": true,  // Optional, default false
-            "languageCodes": ["en"]  // Optional, for transcript
+            "languageCodes": ["en"],  // Optional, for transcript
+            "background": true  // Optional, default false
         }
 
+    With "background": true, the video row is created and the requested
+    fetches run after the response is sent. Poll statusUrl (GET
+    /api/videos/<id>) for the hydrated video.
+
     Returns:
         {
             "id": 1,
@@ -356,15 +509,21 @@ def create_video():
             "transcript": {...} or null,
             "message": "Video created successfully"
         }
+        Background requests also include "status": "hydrating" and
+        "statusUrl".
 
     Status Codes:
         201: Created successfully
+        202: Created, metadata/transcript still being fetched (background)
         400: Invalid request
         500: Internal server error
     """
-    db = SessionLocal()
+    # Nothing outside this request touches the row between our writes, so
+    # keep attributes loaded across commits instead of re-selecting the
+    # video after every write
+    db = SessionLocal(expire_on_commit=False)
     try:
-        data = request.get_json()
+        data = _parse_json()
 
         if not data:
             raise ValidationError("No data provided")
@@ -392,14 +551,42 @@ def create_video():
             }
         )
 
+        if data.get('background', False) and (fetch_metadata or fetch_transcript_flag):
+            video = get_or_create_video(youtube_video_id, db)
+            _FETCH_EXECUTOR.submit(
+                _hydrate_video,
+                video.id,
+                youtube_video_id,
+                fetch_metadata,
+                fetch_transcript_flag,
+                language_codes
+            )
+
+            video_data = serialize_video(video)
+            video_data['message'] = 'Video created; metadata and transcript are being fetched'
+            video_data['status'] = 'hydrating'
+            video_data['statusUrl'] = f'{video_bp.url_prefix}/{youtube_video_id}'
+            return jsonify(video_data), 202
+
+        # Start the YouTube fetches before touching the database so their
+        # network latency overlaps with each other and with the DB writes
+        metadata_future = (
+            _FETCH_EXECUTOR.submit(fetch_youtube_metadata, youtube_video_id)
+            if fetch_metadata else None
+        )
+        transcript_future = (
+            _FETCH_EXECUTOR.submit(fetch_transcript, youtube_video_id, language_codes)
+            if fetch_transcript_flag else None
+        )
+
         # Get or create video
         video = get_or_create_video(youtube_video_id, db)
 
-        # Fetch metadata if requested
+        # Save metadata if requested
         metadata_error = None
-        if fetch_metadata:
+        if metadata_future:
             try:
-                metadata = fetch_youtube_metadata(youtube_video_id)
+                metadata = metadata_future.result()
                 update_video_metadata(
                     video.id,
                     title=metadata.get('title'),
@@ -418,12 +605,12 @@ def create_video():
                     extra={"video_id": youtube_video_id}
                 )
 
-        # Fetch and cache transcript if requested
+        # Cache transcript if requested
         transcript_data = None
         transcript_error = None
-        if fetch_transcript_flag:
+        if transcript_future:
             try:
-                transcript_data = fetch_transcript(youtube_video_id, language_codes)
+                transcript_data = transcript_future.result()
                 cache_transcript(video.id, transcript_data, db)
                 logger.info(f"Transcript fetched and cached", extra={"video_id": youtube_video_id})
             except TranscriptsDisabled:
@@ -437,6 +624,7 @@ def create_video():
                 logger.warning(transcript_error, extra={"video_id": youtube_video_id})
             except Exception as e:
                 # Unexpected error
+                transcript_data = None
                 transcript_error = str(e)
                 logger.error(
                     f"Unexpected error fetching transcript: {e}",
@@ -444,8 +632,9 @@ def create_video():
                     extra={"video_id": youtube_video_id}
                 )
 
-        # Get updated video data
-        video_data = get_video_with_cache(youtube_video_id, db)
+        # Build the response from the in-memory video, which already holds
+        # the metadata and transcript written above (no re-read needed)
+        video_data = serialize_video(video, transcript=transcript_data)
         video_data['message'] = 'Video created successfully'
 
         # Include any warnings about failed fetches
@@ -484,7 +673,7 @@ def create_video():
         db.close()
 
 
-@video_bp.route('/<youtube_video_id>/metadata', methods=['GET'])
+@video_bp.route('/<youtube_video_id>/metadata', methods=['GET'], **ROUTE_OPTIONS)
 def get_video_metadata(youtube_video_id):
     """
     Fetch YouTube metadata for a video.
@@ -514,8 +703,8 @@ def get_video_metadata(youtube_video_id):
     """
     db = SessionLocal()
     try:
-        # Validate video ID
-        if len(youtube_video_id) != 11:
+        # Validate video ID (length and charset) before touching the database
+        if not is_valid_video_id(youtube_video_id):
             return jsonify({'error': 'Invalid YouTube video ID format'}), 400
 
         # Check if caching is requested
@@ -555,7 +744,7 @@ def get_video_metadata(youtube_video_id):
         db.close()
 
 
-@video_bp.route('/history/<firebase_uid>', methods=['GET'])
+@video_bp.route('/history/<firebase_uid>', methods=['GET'], **ROUTE_OPTIONS)
 @auth_required
 def get_video_history(firebase_uid):
     """
@@ -605,12 +794,12 @@ def get_video_history(firebase_uid):
             return jsonify({'error': 'Invalid limit parameter'}), 400
 
         # Get user from database
-        user = db.query(User).filter(User.firebase_uid == firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter(User.firebase_uid == firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User not found'}), 404
 
         # Get video history
-        history_data = get_user_video_history(user.id, db, limit=limit)
+        history_data = get_user_video_history(user_id, db, limit=limit)
 
         return jsonify({
             'data': history_data,
@@ -626,7 +815,7 @@ def get_video_history(firebase_uid):
         db.close()
 
 
-@video_bp.route('/history/<firebase_uid>', methods=['POST'])
+@video_bp.route('/history/<firebase_uid>', methods=['POST'], **ROUTE_OPTIONS)
 @auth_required
 def add_to_video_history(firebase_uid):
     """
@@ -667,7 +856,7 @@ def add_to_video_history(firebase_uid):
             return jsonify({'error': 'Forbidden: Cannot modify another user\'s history'}), 403
 
         # Validate request body
-        data = request.get_json()
+        data = _parse_json()
         if not data:
             return jsonify({'error': 'No data provided'}), 400
 
@@ -692,13 +881,13 @@ def add_to_video_history(firebase_uid):
             return jsonify({'error': 'isCompleted must be a boolean'}), 400
 
         # Get user
-        user = db.query(User).filter(User.firebase_uid == firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter(User.firebase_uid == firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User not found'}), 404
 
         # Save to history
         result = save_video_to_history(
-            user.id,
+            user_id,
             video_id,
             last_position_seconds,
             is_completed,
@@ -722,7 +911,7 @@ def add_to_video_history(firebase_uid):
         db.close()
 
 
-@video_bp.route('/history/<firebase_uid>/<video_id>', methods=['DELETE'])
+@video_bp.route('/history/<firebase_uid>/<video_id>', methods=['DELETE'], **ROUTE_OPTIONS)
 @auth_required
 def remove_from_video_history(firebase_uid, video_id):
     """
@@ -751,12 +940,12 @@ def remove_from_video_history(firebase_uid, video_id):
             return jsonify({'error': 'Forbidden: Cannot modify another user\'s history'}), 403
 
         # Get user
-        user = db.query(User).filter(User.firebase_uid == firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter(User.firebase_uid == firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User not found'}), 404
 
         # Delete from history
-        success = delete_video_from_history(user.id, video_id, db)
+        success = delete_video_from_history(user_id, video_id, db)
 
         if not success:
             return jsonify({'error': 'Video not found in history'}), 404
@@ -774,7 +963,7 @@ def remove_from_video_history(firebase_uid, video_id):
         db.close()
 
 
-@video_bp.route('/history/<firebase_uid>', methods=['DELETE'])
+@video_bp.route('/history/<firebase_uid>', methods=['DELETE'], **ROUTE_OPTIONS)
 @auth_required
 def clear_all_video_history(firebase_uid):
     """
@@ -803,12 +992,12 @@ def clear_all_video_history(firebase_uid):
             return jsonify({'error': 'Forbidden: Cannot modify another user\'s history'}), 403
 
         # Get user
-        user = db.query(User).filter(User.firebase_uid == firebase_uid).first()
-        if not user:
+        user_id = db.query(User.id).filter(User.firebase_uid == firebase_uid).scalar()
+        if user_id is None:
             return jsonify({'error': 'User not found'}), 404
 
         # Clear history
-        deleted_count = clear_video_history(user.id, db)
+        deleted_count = clear_video_history(user_id, db)
 
         return jsonify({
             'message': 'Video history cleared',
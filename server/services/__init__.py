@@ -18,6 +18,7 @@ from .chat_service import (
     generate_chat_response,
     generate_chat_response_stream,
     save_chat_message,
+    save_chat_messages,
     get_chat_history,
     generate_session_id
 )
@@ -28,6 +29,7 @@ from .progress_service import update_progress, mark_complete, get_user_progress,
 from .transcript_service import (
     fetch_transcript,
     extract_video_id,
+    is_valid_video_id,
     get_available_transcripts,
     calculate_video_duration_from_transcript
 )
@@ -35,12 +37,14 @@ from .video_service import (
     get_or_create_video,
     get_video_by_id,
     get_video_by_youtube_id,
+    get_video_id_by_youtube_id,
     cache_transcript,
     cache_checkpoints,
     cache_quiz,
     cache_summary,
     update_video_metadata,
     get_video_with_cache,
+    serialize_video,
     fetch_youtube_metadata,
     get_user_video_history,
     save_video_to_history,
@@ -53,23 +57,27 @@ __all__ = [
     'generate_chat_response',
     'generate_chat_response_stream',
     'save_chat_message',
+    'save_chat_messages',
     'get_chat_history',
     'generate_session_id',
     'generate_quiz',
     'generate_summary',
     'fetch_transcript',
     'extract_video_id',
+    'is_valid_video_id',
     'get_available_transcripts',
     'calculate_video_duration_from_transcript',
     'get_or_create_video',
     'get_video_by_id',
     'get_video_by_youtube_id',
+    'get_video_id_by_youtube_id',
     'cache_transcript',
     'cache_checkpoints',
     'cache_quiz',
     'cache_summary',
     'update_video_metadata',
     'get_video_with_cache',
+    'serialize_video',
     'fetch_youtube_metadata',
     'get_user_video_history',
     'save_video_to_history',
@@ -3,6 +3,7 @@ Chat service for LearnFlow AI tutor.
 Handles business logic for conversational tutoring interactions.
 """
 
+import time
 import uuid
 from datetime import datetime, timezone
 
@@ -16,6 +17,10 @@ from database import SessionLocal
 # Limit transcript length placed into system message to protect token usage
 TRANSCRIPT_MAX_CHARS = 12000
 
+# Streaming defaults: coalesce tiny model chunks before they reach the client
+STREAM_MIN_CHUNK_CHARS = 64
+STREAM_MAX_FLUSH_INTERVAL_MS = 50
+
 
 def build_system_instruction(video_context):
     """
@@ -28,18 +33,80 @@ def build_system_instruction(video_context):
         str: System instruction string passed to the LLM.
     """
     transcript = video_context.get('fullTranscript') or video_context.get('transcriptSnippet') or ''
-    if isinstance(transcript, list):
-        transcript = ' '.join([str(t) for t in transcript])
-
-    transcript_text = str(transcript).strip()
+    transcript_text, is_truncated = _truncate_transcript(transcript, TRANSCRIPT_MAX_CHARS)
     if not transcript_text:
         return system_instructions
 
-    truncated = transcript_text[:TRANSCRIPT_MAX_CHARS]
-    if len(transcript_text) > TRANSCRIPT_MAX_CHARS:
+    language_hint = video_context.get('language')
+    return _format_system_instruction(
+        transcript_text,
+        is_truncated,
+        str(language_hint) if language_hint else None
+    )
+
+
+def _truncate_transcript(transcript, max_chars):
+    """
+    Cut a transcript down to at most max_chars characters.
+
+    List transcripts are joined only until the budget runs out rather than
+    joined in full and sliced. When text has to be dropped, the cut is
+    moved back to the last sentence end if one falls in the second half of
+    the budget, so the model doesn't see a half sentence.
+
+    Args:
+        transcript (str or list): Transcript text, or a list of text pieces
+        max_chars (int): Character budget
+
+    Returns:
+        tuple: (str, bool) the stripped text and whether anything was dropped
+    """
+    if isinstance(transcript, list):
+        parts = []
+        total = 0
+        is_truncated = False
+        for piece in transcript:
+            piece = str(piece)
+            if parts:
+                total += 1  # joining space
+            remaining = max_chars - total
+            if len(piece) > remaining:
+                if remaining > 0:
+                    parts.append(piece[:remaining])
+                is_truncated = True
+                break
+            parts.append(piece)
+            total += len(piece)
+        text = ' '.join(parts).strip()
+    else:
+        text = str(transcript).strip()
+        is_truncated = len(text) > max_chars
+        text = text[:max_chars]
+
+    if is_truncated:
+        sentence_end = max(text.rfind('.'), text.rfind('?'), text.rfind('!'))
+        if sentence_end >= max_chars // 2:
+            text = text[:sentence_end + 1]
+
+    return text, is_truncated
+
+
+def _format_system_instruction(transcript_text, is_truncated, language_hint):
+    """
+    Format the system instruction for a transcript.
+
+    Args:
+        transcript_text (str): Transcript text, already cut to TRANSCRIPT_MAX_CHARS
+        is_truncated (bool): Whether the original transcript was longer
+        language_hint (str or None): Transcript language code
+
+    Returns:
+        str: System instruction string passed to the LLM.
+    """
+    truncated = transcript_text
+    if is_truncated:
         truncated += "\n[Transcript truncated for length]"
 
-    language_hint = video_context.get('language')
     language_line = f"Language: {language_hint}" if language_hint else ""
 
     return f"""{system_instructions}
@@ -50,6 +117,20 @@ Video Transcript Context
 """
 
 
+def _chat_cache_key(video_context):
+    """
+    Build the prompt cache key for chat about a video.
+
+    Args:
+        video_context (dict): Video context with optional videoId
+
+    Returns:
+        str or None: Cache key, or None when the video is unknown
+    """
+    video_id = video_context.get('videoId')
+    return f"learnflow-chat-{video_id}" if video_id else None
+
+
 def generate_chat_response(message, video_context, timestamp=None):
     """
     Generate AI tutor response to student message.
@@ -102,7 +183,8 @@ def generate_chat_response(message, video_context, timestamp=None):
         response_text = client.generate_content(
             prompt=prompt,
             system_instruction=system_instruction,
-            temperature=0.8  # Slightly higher for more conversational tone
+            temperature=0.8,  # Slightly higher for more conversational tone
+            cache_key=_chat_cache_key(video_context)
         )
 
         return {
@@ -115,14 +197,27 @@ def generate_chat_response(message, video_context, timestamp=None):
         raise Exception(f"Failed to generate chat response: {str(e)}")
 
 
-def generate_chat_response_stream(message, video_context, timestamp=None):
+def generate_chat_response_stream(
+    message,
+    video_context,
+    timestamp=None,
+    min_chunk_chars=STREAM_MIN_CHUNK_CHARS,
+    max_flush_interval_ms=STREAM_MAX_FLUSH_INTERVAL_MS
+):
     """
     Generate streaming AI tutor response (for real-time chat UI).
 
+    Model chunks are often only a few characters long, so they are buffered
+    and yielded once the buffer reaches ``min_chunk_chars`` or
+    ``max_flush_interval_ms`` has passed since the last yield, whichever
+    comes first. Anything left over is yielded when the model finishes.
+
     Args:
         message (str): Student's message/question
         video_context (dict): Video context
         timestamp (str, optional): Current video timestamp
+        min_chunk_chars (int): Buffered characters that trigger a flush
+        max_flush_interval_ms (int): Longest time to hold buffered text
 
     Yields:
         str: Text chunks from the model's response
@@ -150,13 +245,32 @@ def generate_chat_response_stream(message, video_context, timestamp=None):
     # Get LLM client and stream response
     client = get_client()
 
+    max_flush_interval = max_flush_interval_ms / 1000
+    buffer = []
+    buffered_chars = 0
+    last_flush = time.monotonic()
+
     try:
         for chunk in client.generate_content_stream(
             prompt=prompt,
             system_instruction=system_instruction,
-            temperature=0.8
+            temperature=0.8,
+            cache_key=_chat_cache_key(video_context)
         ):
-            yield chunk
+            if not chunk:
+                continue
+            buffer.append(chunk)
+            buffered_chars += len(chunk)
+
+            now = time.monotonic()
+            if buffered_chars >= min_chunk_chars or now - last_flush >= max_flush_interval:
+                yield ''.join(buffer)
+                buffer.clear()
+                buffered_chars = 0
+                last_flush = now
+
+        if buffer:
+            yield ''.join(buffer)
 
     except Exception as e:
         raise Exception(f"Failed to generate streaming chat response: {str(e)}")
@@ -172,7 +286,7 @@ def generate_session_id():
     return str(uuid.uuid4())
 
 
-def save_chat_message(user_id, video_id, role, message, session_id=None, timestamp_context=None):
+def save_chat_message(user_id, video_id, role, message, session_id=None, timestamp_context=None, db=None):
     """
     Save a chat message to the database.
     
@@ -183,6 +297,8 @@ def save_chat_message(user_id, video_id, role, message, session_id=None, timesta
         message (str): Message content
         session_id (str, optional): Session ID for grouping conversations
         timestamp_context (str, optional): Video timestamp context (e.g., "05:30")
+        db (Session, optional): Session to write with, e.g. the route's own.
+            If omitted, a short-lived session is opened and closed here.
     
     Returns:
         ChatMessage: The saved message object
@@ -190,7 +306,11 @@ def save_chat_message(user_id, video_id, role, message, session_id=None, timesta
     Raises:
         Exception: If database operation fails
     """
-    db = SessionLocal()
+    owns_session = db is None
+    if owns_session:
+        # Keep the saved row's attributes readable after close without
+        # re-selecting it
+        db = SessionLocal(expire_on_commit=False)
     try:
         chat_message = ChatMessage(
             user_id=user_id,
@@ -203,23 +323,65 @@ def save_chat_message(user_id, video_id, role, message, session_id=None, timesta
         )
         db.add(chat_message)
         db.commit()
-        db.refresh(chat_message)
         return chat_message
     except Exception as e:
         db.rollback()
         raise Exception(f"Failed to save chat message: {str(e)}")
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
-def get_chat_history(video_id, user_id, limit=50):
+def save_chat_messages(messages, db=None):
+    """
+    Save several chat messages in a single transaction.
+
+    Used to persist both sides of a chat turn with one commit.
+
+    Args:
+        messages (list): Dicts with the save_chat_message fields (user_id,
+            video_id, role, message, and optionally session_id,
+            timestamp_context, created_at). created_at defaults to now.
+        db (Session, optional): Session to write with, e.g. the route's own.
+            If omitted, a short-lived session is opened and closed here.
+
+    Returns:
+        list: The saved ChatMessage objects, in the given order
+
+    Raises:
+        Exception: If database operation fails
+    """
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal(expire_on_commit=False)
+    try:
+        now = datetime.now(timezone.utc)
+        chat_messages = [ChatMessage(**{'created_at': now, **item}) for item in messages]
+        db.add_all(chat_messages)
+        db.commit()
+        return chat_messages
+    except Exception as e:
+        db.rollback()
+        raise Exception(f"Failed to save chat messages: {str(e)}")
+    finally:
+        if owns_session:
+            db.close()
+
+
+def get_chat_history(video_id, user_id, limit=50, db=None):
     """
     Retrieve chat history for a video and user.
+
+    Returns the most recent ``limit`` messages, oldest first. They are read
+    newest-first so the (video_id, user_id, created_at) index can stop
+    after ``limit`` rows, then put back in chronological order.
     
     Args:
         video_id (int): Video ID
         user_id (int): User ID
         limit (int): Maximum number of messages to retrieve (default: 50)
+        db (Session, optional): Session to read with, e.g. the route's own.
+            If omitted, a short-lived session is opened and closed here.
     
     Returns:
         list: List of chat message dictionaries, ordered by creation time
@@ -227,25 +389,35 @@ def get_chat_history(video_id, user_id, limit=50):
     Raises:
         Exception: If database operation fails
     """
-    db = SessionLocal()
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
     try:
-        messages = db.query(ChatMessage).filter(
+        rows = db.query(
+            ChatMessage.id,
+            ChatMessage.role,
+            ChatMessage.message,
+            ChatMessage.timestamp_context,
+            ChatMessage.session_id,
+            ChatMessage.created_at
+        ).filter(
             ChatMessage.video_id == video_id,
             ChatMessage.user_id == user_id
-        ).order_by(ChatMessage.created_at.asc()).limit(limit).all()
-        
+        ).order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit).all()
+
         return [
             {
-                'id': msg.id,
-                'role': msg.role,
-                'message': msg.message,
-                'timestamp_context': msg.timestamp_context,
-                'session_id': msg.session_id,
-                'created_at': msg.created_at.isoformat() if msg.created_at else None
+                'id': row.id,
+                'role': row.role,
+                'message': row.message,
+                'timestamp_context': row.timestamp_context,
+                'session_id': row.session_id,
+                'created_at': row.created_at.isoformat() if row.created_at else None
             }
-            for msg in messages
+            for row in reversed(rows)
         ]
     except Exception as e:
         raise Exception(f"Failed to retrieve chat history: {str(e)}")
     finally:
-        db.close()
+        if owns_session:
+            db.close()
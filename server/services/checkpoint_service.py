@@ -3,10 +3,15 @@ Checkpoint generation service for LearnFlow.
 Handles business logic for generating learning checkpoints from video transcripts.
 """
 
-import json
+import orjson
 import re
 from llm import get_client
 from prompts.checkpoint_prompt import get_checkpoint_prompt
+from utils.llm_text import seconds_to_mmss, strip_code_fence
+
+# Checkpoint timestamps are MM:SS
+_TS_RE = re.compile(r'^\d{1,2}:[0-5]\d$')
+_CHECKPOINT_FIELDS = ('timestamp', 'title', 'subtopic', 'question', 'options', 'correctAnswer', 'explanation')
 
 
 def format_transcript_for_llm(snippets):
@@ -26,43 +31,40 @@ def format_transcript_for_llm(snippets):
     Raises:
         ValueError: If snippet is missing required fields
     """
-    formatted_lines = []
+    try:
+        return '\n'.join([
+            f"[{seconds_to_mmss(snippet['start'])}] {snippet['text'].strip()}"
+            for snippet in snippets
+        ])
+    except (KeyError, TypeError, AttributeError):
+        # Only re-scan on failure, so the error can name the bad snippet
+        _validate_snippets(snippets)
+        raise
+
+
+def _validate_snippets(snippets):
+    """
+    Check that every snippet is a dict with 'start' and 'text' fields.
 
+    Args:
+        snippets (list): List of transcript snippets
+
+    Raises:
+        ValueError: If a snippet is malformed
+    """
     for idx, snippet in enumerate(snippets):
-        # Validate required fields
         if not isinstance(snippet, dict):
             raise ValueError(f"Snippet at index {idx} is not a dictionary")
-        
+
         if 'start' not in snippet:
             raise ValueError(
                 f"Snippet at index {idx} is missing 'start' field"
             )
-        
+
         if 'text' not in snippet:
             raise ValueError(
                 f"Snippet at index {idx} is missing 'text' field"
             )
-        
-        timestamp = seconds_to_mmss(snippet['start'])
-        text = snippet['text'].strip()
-        formatted_lines.append(f"[{timestamp}] {text}")
-
-    return '\n'.join(formatted_lines)
-
-
-def seconds_to_mmss(seconds):
-    """
-    Convert seconds to MM:SS format.
-
-    Args:
-        seconds (float): Time in seconds
-
-    Returns:
-        str: Formatted time as MM:SS
-    """
-    minutes = int(seconds // 60)
-    secs = int(seconds % 60)
-    return f"{minutes:02d}:{secs:02d}"
 
 
 def mmss_to_seconds(timestamp):
@@ -129,13 +131,12 @@ def validate_checkpoint_response(response_data):
         if not isinstance(checkpoint, dict):
             return False
 
-        required_fields = ['timestamp', 'title', 'subtopic', 'question', 'options', 'correctAnswer', 'explanation']
-        if not all(field in checkpoint for field in required_fields):
+        if not all(field in checkpoint for field in _CHECKPOINT_FIELDS):
             return False
 
         # Validate timestamp format (MM:SS)
         timestamp = checkpoint['timestamp']
-        if not re.match(r'^\d{1,2}:[0-5]\d$', timestamp):
+        if not isinstance(timestamp, str) or not _TS_RE.match(timestamp):
             return False
 
         # Validate options is a list with 4 items
@@ -150,15 +151,57 @@ def validate_checkpoint_response(response_data):
         if checkpoint['correctAnswer'] not in checkpoint['options']:
             return False
 
-        # Validate explanation exists and is non-empty
-        if 'explanation' not in checkpoint:
-            return False
+        # Validate explanation is non-empty
         if not isinstance(checkpoint['explanation'], str) or not checkpoint['explanation'].strip():
             return False
 
     return True
 
 
+def _collect_json_object(chunks):
+    """
+    Join a streamed LLM reply that is expected to be a JSON object.
+
+    Checkpoint replies are long, so the reply is streamed and its start
+    checked as soon as it arrives: if the first character after any opening
+    markdown fence isn't '{' (e.g. the model answered in prose), reading
+    stops right away instead of after the whole reply has been generated.
+
+    Args:
+        chunks (iterable): Text chunks from the model
+
+    Returns:
+        str: The full reply text
+
+    Raises:
+        ValueError: If the reply doesn't start like a JSON object
+    """
+    parts = []
+    checked = False
+
+    for chunk in chunks:
+        parts.append(chunk)
+        if checked:
+            continue
+
+        head = ''.join(parts).lstrip()
+        if head.startswith('```'):
+            # Wait for the end of the fence line before looking further
+            if '\n' not in head:
+                continue
+            head = head.split('\n', 1)[1].lstrip()
+        elif '```'.startswith(head):
+            continue
+
+        if not head:
+            continue
+        if head[0] != '{':
+            raise ValueError("Invalid checkpoint response format from LLM")
+        checked = True
+
+    return ''.join(parts)
+
+
 def generate_checkpoints(transcript_data, video_id):
     """
     Generate learning checkpoints from video transcript.
@@ -221,43 +264,40 @@ def generate_checkpoints(transcript_data, video_id):
     client = get_client()
 
     try:
-        response_text = client.generate_content(
+        stream = client.generate_content_stream(
             prompt=prompt,
             temperature=0.7
         )
+        try:
+            response_text = _collect_json_object(stream)
+        finally:
+            stream.close()
 
         # Parse JSON response
         # Remove markdown code blocks if present
-        response_text = response_text.strip()
-        if response_text.startswith('```'):
-            # Extract JSON from code block
-            lines = response_text.split('\n')
-            response_text = '\n'.join(
-                line for line in lines
-                if not line.strip().startswith('```')
-            )
+        response_text = strip_code_fence(response_text)
 
-        response_data = json.loads(response_text)
+        response_data = orjson.loads(response_text)
 
         # Validate response
         if not validate_checkpoint_response(response_data):
             raise ValueError("Invalid checkpoint response format from LLM")
 
         # Process checkpoints
-        checkpoints = []
-        for idx, checkpoint in enumerate(response_data['checkpoints'], 1):
-            timestamp_seconds = mmss_to_seconds(checkpoint['timestamp'])
-            checkpoints.append({
+        checkpoints = [
+            {
                 'id': idx,
                 'timestamp': checkpoint['timestamp'],
-                'timestampSeconds': timestamp_seconds,
+                'timestampSeconds': mmss_to_seconds(checkpoint['timestamp']),
                 'title': checkpoint['title'],
                 'subtopic': checkpoint['subtopic'],
                 'question': checkpoint['question'],
                 'options': checkpoint['options'],
                 'correctAnswer': checkpoint['correctAnswer'],
                 'explanation': checkpoint['explanation']
-            })
+            }
+            for idx, checkpoint in enumerate(response_data['checkpoints'], 1)
+        ]
 
         return {
             'videoId': video_id,
@@ -266,7 +306,10 @@ def generate_checkpoints(transcript_data, video_id):
             'totalCheckpoints': len(checkpoints)
         }
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Failed to parse LLM response as JSON: {str(e)}")
+    except ValueError:
+        # Invalid replies, including the early abort while streaming
+        raise
     except Exception as e:
         raise Exception(f"Failed to generate checkpoints: {str(e)}")
@@ -4,56 +4,74 @@ Handles business logic for tracking user video watch progress and completion sta
 """
 
 from datetime import datetime
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import and_, or_
 from models import UserVideoProgress, User, Video
+from utils.cache import video_duration_cache
+from utils.db_upsert import dialect_insert
 
 
-def get_or_create_progress(user_id, video_id, db):
+def get_or_create_progress(user_id, video_id, db, now=None):
     """
     Get existing progress record or create a new one.
 
+    The user, the video and any existing progress are looked up in one
+    query, starting from the user and outer-joining the other two, so a
+    missing user, a missing video and missing progress can each be told
+    apart without extra round-trips.
+
+    A new record is flushed but not committed; callers commit it together
+    with their own changes.
+
     Args:
         user_id (int): User database ID
         video_id (int): Video database ID
         db: Database session
+        now (datetime): Timestamp for a new record's watch times, so callers
+            can share one "now" with their own updates (default: utcnow)
 
     Returns:
-        tuple: (UserVideoProgress, Video) - Progress record and associated video
+        tuple: (UserVideoProgress, int) - Progress record and the video's
+            duration in seconds
 
     Raises:
         ValueError: If user or video doesn't exist
     """
-    # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise ValueError(f"User with id {user_id} not found")
+    row = db.query(
+        Video.id.label('video_id'),
+        Video.duration_seconds,
+        UserVideoProgress
+    ).select_from(User).outerjoin(
+        Video, Video.id == video_id
+    ).outerjoin(
+        UserVideoProgress,
+        and_(
+            UserVideoProgress.user_id == User.id,
+            UserVideoProgress.video_id == Video.id
+        )
+    ).filter(User.id == user_id).first()
 
-    # Check if video exists
-    video = db.query(Video).filter(Video.id == video_id).first()
-    if not video:
+    if row is None:
+        raise ValueError(f"User with id {user_id} not found")
+    if row.video_id is None:
         raise ValueError(f"Video with id {video_id} not found")
 
-    # Get or create progress record
-    progress = db.query(UserVideoProgress).filter(
-        UserVideoProgress.user_id == user_id,
-        UserVideoProgress.video_id == video_id
-    ).first()
-
+    progress = row.UserVideoProgress
     if not progress:
+        if now is None:
+            now = datetime.utcnow()
         progress = UserVideoProgress(
             user_id=user_id,
             video_id=video_id,
             last_position_seconds=0,
             is_completed=False,
             watch_count=1,
-            first_watched_at=datetime.utcnow(),
-            last_watched_at=datetime.utcnow()
+            first_watched_at=now,
+            last_watched_at=now
         )
         db.add(progress)
-        db.commit()
-        db.refresh(progress)
+        db.flush()
 
-    return progress, video
+    return progress, row.duration_seconds or 0
 
 
 def update_progress(user_id, video_id, position_seconds, db):
@@ -84,23 +102,136 @@ def update_progress(user_id, video_id, position_seconds, db):
     if position_seconds < 0:
         raise ValueError("Position cannot be negative")
 
-    # Get or create progress (also returns video to avoid redundant fetch)
-    progress, video = get_or_create_progress(user_id, video_id, db)
+    upsert = dialect_insert(db, UserVideoProgress)
+    if upsert is None:
+        return _update_progress_orm(user_id, video_id, position_seconds, db)
+
+    # Check the user and video exist and get the duration in one query
+    row = db.query(
+        Video.id.label('video_id'),
+        Video.duration_seconds
+    ).select_from(User).outerjoin(
+        Video, Video.id == video_id
+    ).filter(User.id == user_id).first()
+
+    if row is None:
+        raise ValueError(f"User with id {user_id} not found")
+    if row.video_id is None:
+        raise ValueError(f"Video with id {video_id} not found")
+
+    video_duration = row.duration_seconds or 0
+    if video_duration > 0:
+        video_duration_cache.set(video_id, video_duration)
+
+    # Auto-complete if watched 95% or more
+    reached_end = video_duration > 0 and position_seconds >= video_duration * 0.95
+
+    # Create or update the progress row in a single statement. Completion
+    # is sticky: an earlier completion is kept when the position moves back.
+    now = datetime.utcnow()
+    table = UserVideoProgress.__table__
+    stmt = upsert.values(
+        user_id=user_id,
+        video_id=video_id,
+        last_position_seconds=position_seconds,
+        is_completed=reached_end,
+        watch_count=1,
+        first_watched_at=now,
+        last_watched_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.video_id],
+        set_={
+            'last_position_seconds': stmt.excluded.last_position_seconds,
+            'last_watched_at': stmt.excluded.last_watched_at,
+            'is_completed': or_(table.c.is_completed, stmt.excluded.is_completed)
+        }
+    ).returning(
+        UserVideoProgress.user_id,
+        UserVideoProgress.video_id,
+        UserVideoProgress.last_position_seconds,
+        UserVideoProgress.is_completed,
+        UserVideoProgress.watch_count,
+        UserVideoProgress.last_watched_at
+    )
+    progress = db.execute(stmt).one()
+    db.commit()
+
+    return _serialize_progress(progress)
+
+
+def _update_progress_orm(user_id, video_id, position_seconds, db):
+    """
+    Update progress through the ORM, for backends without native upsert.
+
+    Args:
+        user_id (int): User database ID
+        video_id (int): Video database ID
+        position_seconds (int): Current playback position in seconds
+        db: Database session
 
-    # Get video duration for completion check
-    video_duration = video.duration_seconds if video else 0
+    Returns:
+        dict: Updated progress data, as returned by update_progress
+    """
+    now = datetime.utcnow()
+
+    # Get or create progress (also returns the video duration for the
+    # completion check, avoiding a separate video fetch)
+    progress, video_duration = get_or_create_progress(user_id, video_id, db, now=now)
 
     # Update progress
     progress.last_position_seconds = position_seconds
-    progress.last_watched_at = datetime.utcnow()
+    progress.last_watched_at = now
 
     # Auto-complete if watched 95% or more
     if video_duration > 0 and position_seconds >= video_duration * 0.95:
         progress.is_completed = True
 
+    # Serialize before committing, while the attributes are still loaded,
+    # so the commit's expiry doesn't cost a reload
+    result = _serialize_progress(progress)
     db.commit()
-    db.refresh(progress)
+    return result
 
+
+def _get_video_duration(video_id, db):
+    """
+    Get a video's duration, cached by database ID once known.
+
+    Only positive durations are cached: a video whose metadata hasn't been
+    fetched yet reports 0, which must not stick once the real duration is
+    written. The video service drops the entry on every write in this
+    process.
+
+    Args:
+        video_id (int): Video database ID
+        db: Database session
+
+    Returns:
+        int or None: Duration in seconds (0 if unknown), or None if the
+            video doesn't exist
+    """
+    video_duration = video_duration_cache.get(video_id)
+    if video_duration is None:
+        row = db.query(Video.duration_seconds).filter(Video.id == video_id).first()
+        if row is None:
+            return None
+        video_duration = row.duration_seconds or 0
+        if video_duration > 0:
+            video_duration_cache.set(video_id, video_duration)
+    return video_duration
+
+
+def _serialize_progress(progress):
+    """
+    Format a progress record for API responses.
+
+    Args:
+        progress: UserVideoProgress instance or row with the same fields
+
+    Returns:
+        dict: Progress data
+    """
     return {
         'userId': progress.user_id,
         'videoId': progress.video_id,
@@ -126,24 +257,18 @@ def mark_complete(user_id, video_id, db):
     Raises:
         ValueError: If user or video doesn't exist
     """
-    # Get or create progress (video not needed here, but returned to maintain consistency)
-    progress, _ = get_or_create_progress(user_id, video_id, db)
+    now = datetime.utcnow()
+
+    # Get or create progress (duration not needed here)
+    progress, _ = get_or_create_progress(user_id, video_id, db, now=now)
 
     # Mark as complete
     progress.is_completed = True
-    progress.last_watched_at = datetime.utcnow()
+    progress.last_watched_at = now
 
+    result = _serialize_progress(progress)
     db.commit()
-    db.refresh(progress)
-
-    return {
-        'userId': progress.user_id,
-        'videoId': progress.video_id,
-        'lastPositionSeconds': progress.last_position_seconds,
-        'isCompleted': progress.is_completed,
-        'watchCount': progress.watch_count,
-        'lastWatchedAt': progress.last_watched_at.isoformat() if progress.last_watched_at else None
-    }
+    return result
 
 
 def get_user_progress(user_id, db):
@@ -172,37 +297,52 @@ def get_user_progress(user_id, db):
     Raises:
         ValueError: If user doesn't exist
     """
-    # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise ValueError(f"User with id {user_id} not found")
-
-    # Get all progress records for user
-    progress_records = db.query(UserVideoProgress).filter(
-        UserVideoProgress.user_id == user_id
+    # Start from the user so one query both checks it exists and fetches
+    # its progress with the few video columns needed. A user without
+    # progress yields a single row of NULLs; video is outer-joined too so
+    # progress whose video row is gone is still listed.
+    rows = db.query(
+        User.id,
+        UserVideoProgress.video_id,
+        UserVideoProgress.last_position_seconds,
+        UserVideoProgress.is_completed,
+        UserVideoProgress.watch_count,
+        UserVideoProgress.last_watched_at,
+        Video.youtube_video_id,
+        Video.duration_seconds
+    ).outerjoin(
+        UserVideoProgress, UserVideoProgress.user_id == User.id
+    ).outerjoin(
+        Video, Video.id == UserVideoProgress.video_id
+    ).filter(
+        User.id == user_id
     ).all()
 
+    if not rows:
+        raise ValueError(f"User with id {user_id} not found")
+
     # Format response with video details
     result = []
-    for progress in progress_records:
-        video = db.query(Video).filter(Video.id == progress.video_id).first()
+    for row in rows:
+        if row.video_id is None:
+            continue
 
         # Calculate progress percentage
         progress_percentage = 0.0
-        if video and video.duration_seconds > 0:
+        if row.duration_seconds and row.duration_seconds > 0:
             progress_percentage = min(
-                (progress.last_position_seconds / video.duration_seconds) * 100,
+                (row.last_position_seconds / row.duration_seconds) * 100,
                 100.0
             )
 
         result.append({
-            'videoId': progress.video_id,
-            'youtubeVideoId': video.youtube_video_id if video else None,
-            'lastPositionSeconds': progress.last_position_seconds,
-            'isCompleted': progress.is_completed,
-            'watchCount': progress.watch_count,
+            'videoId': row.video_id,
+            'youtubeVideoId': row.youtube_video_id,
+            'lastPositionSeconds': row.last_position_seconds,
+            'isCompleted': row.is_completed,
+            'watchCount': row.watch_count,
             'progressPercentage': round(progress_percentage, 1),
-            'lastWatchedAt': progress.last_watched_at.isoformat() if progress.last_watched_at else None
+            'lastWatchedAt': row.last_watched_at.isoformat() if row.last_watched_at else None
         })
 
     return result
@@ -237,14 +377,12 @@ def get_video_progress(user_id, video_id, db):
     if not progress:
         return None
 
-    # Get video for duration
-    video = db.query(Video).filter(Video.id == video_id).first()
-
     # Calculate progress percentage
+    video_duration = _get_video_duration(video_id, db)
     progress_percentage = 0.0
-    if video and video.duration_seconds > 0:
+    if video_duration:
         progress_percentage = min(
-            (progress.last_position_seconds / video.duration_seconds) * 100,
+            (progress.last_position_seconds / video_duration) * 100,
             100.0
         )
 
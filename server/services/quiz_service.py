@@ -3,20 +3,31 @@ Quiz generation service for LearnFlow.
 Handles business logic for generating quiz questions from video transcripts.
 """
 
-import json
+import logging
+import operator
+import orjson
 from llm import get_client
 from prompts.quiz_prompt import get_quiz_prompt
+from utils.llm_text import strip_code_fence
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Fetches a question's required fields, raising KeyError if any is missing
+_get_question_fields = operator.itemgetter('question', 'options', 'correctAnswer')
 
-def format_transcript_for_quiz(snippets):
+# Letter answers the LLM sometimes returns instead of an index
+_ANSWER_LETTERS = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
+
+
+def format_transcript_for_quiz(snippets, max_chars=None):
     """
     Format transcript snippets for quiz generation.
 
     Args:
         snippets (list): List of transcript snippets with text, start, duration
+        max_chars (int): Optional length cap. Snippets past it aren't
+            formatted and the text is cut to max_chars with "..." appended.
 
     Returns:
         str: Formatted transcript text
@@ -24,10 +35,8 @@ def format_transcript_for_quiz(snippets):
     Raises:
         ValueError: If snippet is missing required fields
     """
-    formatted_lines = []
-
+    # Validate every snippet, including those past the cap
     for idx, snippet in enumerate(snippets):
-        # Validate required fields
         if not isinstance(snippet, dict):
             raise ValueError(f"Snippet at index {idx} is not a dictionary")
 
@@ -41,105 +50,96 @@ def format_transcript_for_quiz(snippets):
                 f"Snippet at index {idx} is missing 'start' field"
             )
 
+    if max_chars is None:
+        return ' '.join(snippet['text'].strip() for snippet in snippets)
+
+    # Stop formatting once the joined text would pass the cap
+    formatted_lines = []
+    length = -1  # No separator before the first line
+    for snippet in snippets:
         text = snippet['text'].strip()
         formatted_lines.append(text)
+        length += len(text) + 1
+        if length > max_chars:
+            return ' '.join(formatted_lines)[:max_chars] + "..."
 
     return ' '.join(formatted_lines)
 
 
-def validate_quiz_response(response_data, expected_questions):
+def parse_quiz_response(response_data):
     """
-    Validate the quiz response from LLM.
+    Validate the quiz response from LLM and build the question list.
+
+    Validation, correctAnswer normalization (string digits like "0" and
+    letters like "A" become indices 0-3) and output formatting happen in a
+    single pass over the questions.
 
     Args:
         response_data (dict): Parsed JSON response from LLM
-        expected_questions (int): Expected number of questions
 
     Returns:
-        bool: True if valid, False otherwise
+        list or None: Question dicts with 1-based IDs, or None if the
+            response is invalid
     """
     if not isinstance(response_data, dict):
-        return False
+        return None
 
     if 'questions' not in response_data:
-        return False
+        return None
 
     questions = response_data['questions']
     if not isinstance(questions, list) or len(questions) == 0:
-        return False
+        return None
 
-    # Validate each question
-    # Validate each question
+    parsed = []
     for idx, question in enumerate(questions):
         if not isinstance(question, dict):
             logger.debug(f"Quiz Validation Error: Question {idx} is not a dict")
-            return False
+            return None
 
-        required_fields = ['question', 'options', 'correctAnswer']
-        if not all(field in question for field in required_fields):
+        try:
+            question_text, options, correct_answer = _get_question_fields(question)
+        except KeyError:
             logger.debug(f"Quiz Validation Error: Question {idx} missing fields. Found keys: {question.keys()}")
-            return False
+            return None
 
         # Check for empty question text
-        if not question['question'].strip():
+        if not question_text.strip():
             logger.debug(f"Quiz Validation Error: Question {idx} has empty text")
-            return False
+            return None
 
         # Validate options
-        options = question['options']
         if not isinstance(options, list) or len(options) != 4:
             logger.debug(f"Quiz Validation Error: Question {idx} options not a list of 4: {options}")
-            return False
+            return None
 
-        # Check for duplicate options (common LLM mistake)
-        if len(set(options)) != len(options):
+        # Check for duplicate options (common LLM mistake). With exactly
+        # four, pairwise comparison is cheaper than building a set.
+        a, b, c, d = options
+        if a == b or a == c or a == d or b == c or b == d or c == d:
             logger.debug(f"Quiz Validation Error: Question {idx} has duplicate options: {options}")
-            return False
+            return None
 
-        # Validate correctAnswer (normalize without mutating input)
-        correct_answer = question['correctAnswer']
-        normalized_correct_answer = correct_answer
-        
-        # Convert string "0" to 0
-        if isinstance(correct_answer, str) and correct_answer.isdigit():
-            normalized_correct_answer = int(correct_answer)
-        # Convert "A", "B", "C", "D" to 0, 1, 2, 3
-        elif isinstance(correct_answer, str) and correct_answer.upper() in ['A', 'B', 'C', 'D']:
-            mapping = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
-            normalized_correct_answer = mapping[correct_answer.upper()]
+        # Normalize correctAnswer (common LLM formatting variations)
+        if isinstance(correct_answer, str):
+            if correct_answer.isdigit():
+                correct_answer = int(correct_answer)
+            else:
+                correct_answer = _ANSWER_LETTERS.get(correct_answer.upper())
 
-        if not isinstance(normalized_correct_answer, int) or normalized_correct_answer not in [0, 1, 2, 3]:
-            logger.debug(f"Quiz Validation Error: Question {idx} invalid correctAnswer: {correct_answer}")
-            return False
+        if not isinstance(correct_answer, int) or correct_answer not in (0, 1, 2, 3):
+            logger.debug(f"Quiz Validation Error: Question {idx} invalid correctAnswer: {question['correctAnswer']}")
+            return None
 
-    return True
+        parsed.append({
+            'id': idx + 1,
+            'question': question_text,
+            'options': options,
+            'correctAnswer': correct_answer,
+            'explanation': question.get('explanation', '')
+        })
 
-
-def normalize_quiz_response(response_data):
-    """
-    Normalize quiz response by fixing common LLM errors.
-
-    Transforms correctAnswer values to integer indices (0-3) by handling
-    various LLM output formats like string digits ("0") or letters ("A").
-
-    Args:
-        response_data (dict): Validated quiz response containing questions.
-            Modified in place.
-
-    Returns:
-        None: Modifies response_data in place.
-    """
-    for question in response_data['questions']:
-        correct_answer = question['correctAnswer']
-        
-        # Convert string "0" to 0
-        if isinstance(correct_answer, str) and correct_answer.isdigit():
-            question['correctAnswer'] = int(correct_answer)
-            
-        # Convert "A", "B", "C", "D" to 0, 1, 2, 3
-        elif isinstance(correct_answer, str) and correct_answer.upper() in ['A', 'B', 'C', 'D']:
-            mapping = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
-            question['correctAnswer'] = mapping[correct_answer.upper()]
+    return parsed
 
 
 def generate_quiz(transcript_data, video_id, num_questions=5):
@@ -188,13 +188,8 @@ def generate_quiz(transcript_data, video_id, num_questions=5):
     if not isinstance(num_questions, int) or num_questions < 1 or num_questions > 20:
         raise ValueError("Number of questions must be between 1 and 20")
 
-    # Format transcript
-    formatted_transcript = format_transcript_for_quiz(snippets)
-
-    # Limit transcript length for API efficiency
-    max_chars = 8000
-    if len(formatted_transcript) > max_chars:
-        formatted_transcript = formatted_transcript[:max_chars] + "..."
+    # Format transcript, limiting its length for API efficiency
+    formatted_transcript = format_transcript_for_quiz(snippets, max_chars=8000)
 
     # Generate prompt
     prompt = get_quiz_prompt(
@@ -214,36 +209,18 @@ def generate_quiz(transcript_data, video_id, num_questions=5):
 
         # Parse JSON response
         # Remove markdown code blocks if present
-        response_text = response_text.strip()
-        if response_text.startswith('```'):
-            # Extract JSON from code block
-            lines = response_text.split('\n')
-            response_text = '\n'.join(
-                line for line in lines
-                if not line.strip().startswith('```')
-            )
+        response_text = strip_code_fence(response_text)
 
-        response_data = json.loads(response_text)
-        logger.debug(f"Generated Quiz Data: {json.dumps(response_data, indent=2)}")
+        response_data = orjson.loads(response_text)
+        if logger.isEnabledFor(logging.DEBUG):
+            pretty = orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode()
+            logger.debug(f"Generated Quiz Data: {pretty}")
 
-        # Validate response
-        if not validate_quiz_response(response_data, num_questions):
+        # Validate, normalize and format the questions
+        questions = parse_quiz_response(response_data)
+        if questions is None:
             raise ValueError("Invalid quiz response format from LLM")
 
-        # Normalize response (fix common LLM errors)
-        normalize_quiz_response(response_data)
-
-        # Process questions
-        questions = []
-        for idx, question in enumerate(response_data['questions'], 1):
-            questions.append({
-                'id': idx,
-                'question': question['question'],
-                'options': question['options'],
-                'correctAnswer': question['correctAnswer'],
-                'explanation': question.get('explanation', '')
-            })
-
         return {
             'videoId': video_id,
             'language': language_code,
@@ -251,7 +228,7 @@ def generate_quiz(transcript_data, video_id, num_questions=5):
             'totalQuestions': len(questions)
         }
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Failed to parse LLM response as JSON: {str(e)}")
     except Exception as e:
         raise Exception(f"Failed to generate quiz: {str(e)}")
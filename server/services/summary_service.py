@@ -3,10 +3,10 @@ Summary generation service for LearnFlow.
 Handles business logic for generating video summaries from transcripts.
 """
 
-import json
-import re
+import orjson
 from llm import get_client
 from prompts.summary_prompt import get_summary_prompt
+from utils.llm_text import seconds_to_mmss, strip_code_fence
 
 
 def format_transcript_for_llm(snippets):
@@ -26,10 +26,28 @@ def format_transcript_for_llm(snippets):
     Raises:
         ValueError: If snippet is missing required fields
     """
-    formatted_lines = []
+    try:
+        return '\n'.join([
+            f"[{seconds_to_mmss(snippet['start'])}] {snippet['text'].strip()}"
+            for snippet in snippets
+        ])
+    except (KeyError, TypeError, AttributeError):
+        # Only re-scan on failure, so the error can name the bad snippet
+        _validate_snippets(snippets)
+        raise
+
+
+def _validate_snippets(snippets):
+    """
+    Check that every snippet is a dict with 'start' and 'text' fields.
+
+    Args:
+        snippets (list): List of transcript snippets
 
+    Raises:
+        ValueError: If a snippet is malformed
+    """
     for idx, snippet in enumerate(snippets):
-        # Validate required fields
         if not isinstance(snippet, dict):
             raise ValueError(f"Snippet at index {idx} is not a dictionary")
 
@@ -43,27 +61,6 @@ def format_transcript_for_llm(snippets):
                 f"Snippet at index {idx} is missing 'text' field"
             )
 
-        timestamp = seconds_to_mmss(snippet['start'])
-        text = snippet['text'].strip()
-        formatted_lines.append(f"[{timestamp}] {text}")
-
-    return '\n'.join(formatted_lines)
-
-
-def seconds_to_mmss(seconds):
-    """
-    Convert seconds to MM:SS format.
-
-    Args:
-        seconds (float): Time in seconds
-
-    Returns:
-        str: Formatted time as MM:SS
-    """
-    minutes = int(seconds // 60)
-    secs = int(seconds % 60)
-    return f"{minutes:02d}:{secs:02d}"
-
 
 def calculate_video_duration(snippets):
     """
@@ -100,12 +97,12 @@ def validate_summary_response(response_data):
         return False
 
     summary = response_data['summary']
-    if not isinstance(summary, str) or len(summary.strip()) == 0:
+    if not isinstance(summary, str):
         return False
 
-    # Basic validation: summary should have at least some content
-    word_count = len(summary.split())
-    if word_count < 10:
+    # Basic validation: summary should have at least some content.
+    # Splitting stops after the tenth word; blank summaries have none.
+    if len(summary.split(maxsplit=10)) < 10:
         return False
 
     return True
@@ -168,16 +165,9 @@ def generate_summary(transcript_data, video_id):
 
         # Parse JSON response
         # Remove markdown code blocks if present
-        response_text = response_text.strip()
-        if response_text.startswith('```'):
-            # Extract JSON from code block
-            lines = response_text.split('\n')
-            response_text = '\n'.join(
-                line for line in lines
-                if not line.strip().startswith('```')
-            )
+        response_text = strip_code_fence(response_text)
 
-        response_data = json.loads(response_text)
+        response_data = orjson.loads(response_text)
 
         # Validate response
         if not validate_summary_response(response_data):
@@ -193,7 +183,7 @@ def generate_summary(transcript_data, video_id):
             'wordCount': word_count
         }
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Failed to parse LLM response as JSON: {str(e)}")
     except Exception as e:
         raise Exception(f"Failed to generate summary: {str(e)}")
@@ -13,8 +13,12 @@ videos, API failures).
 """
 
 import re
+import operator
 import os
+import string
+import threading
 from datetime import datetime
+from functools import lru_cache
 
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import (
@@ -28,6 +32,52 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Characters allowed in a YouTube video ID (URL-safe base64)
+_VIDEO_ID_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+
+# Longest input extract_video_id accepts; real YouTube URLs are far shorter
+_MAX_VIDEO_URL_LENGTH = 2048
+
+# Video ID inside watch, youtu.be, embed and /v/ URLs
+_VIDEO_URL_RE = re.compile(
+    r'(?:https?:\/\/)?(?:www\.)?'
+    r'(?:youtube\.com\/(?:watch\?v=|embed\/|v\/)|youtu\.be\/)'
+    r'([a-zA-Z0-9_-]{11})'
+)
+
+# Shared YouTubeTranscriptApi client, created on first use (see _get_transcript_api)
+_transcript_api = None
+_transcript_api_lock = threading.Lock()
+
+# SRT cue timestamp (start time only), e.g. "00:01:02,500"
+_SRT_TIMESTAMP_RE = re.compile(r'(\d{2}):(\d{2}):(\d{2}),(\d{3})')
+
+# Snippet field getters for _format_transcript_response
+_snippet_attrs = operator.attrgetter('text', 'start', 'duration')
+_snippet_items = operator.itemgetter('text', 'start', 'duration')
+
+
+def _get_transcript_api():
+    """
+    Get the process-wide YouTubeTranscriptApi client.
+
+    The client owns a requests.Session, so reusing it keeps the TCP/TLS
+    connection to YouTube alive across fetches instead of handshaking on
+    every call. A single instance is shared rather than one per thread:
+    under the gevent worker threading.local is greenlet-local, which would
+    create a fresh client (and connection) per request. The session's
+    connection pool handles concurrent greenlets and threads.
+
+    Returns:
+        YouTubeTranscriptApi instance
+    """
+    global _transcript_api
+    if _transcript_api is None:
+        with _transcript_api_lock:
+            if _transcript_api is None:
+                _transcript_api = YouTubeTranscriptApi()
+    return _transcript_api
+
 
 def _fetch_transcript_youtube_api(video_id, language_codes=None):
     """
@@ -118,7 +168,7 @@ def _parse_srt_to_snippets(srt_content):
             continue
             
         # Parse timestamp line (format: 00:00:00,000 --> 00:00:02,000)
-        timestamp_match = re.search(r'(\d{2}):(\d{2}):(\d{2}),(\d{3})', lines[1])
+        timestamp_match = _SRT_TIMESTAMP_RE.search(lines[1])
         if timestamp_match:
             h, m, s, ms = map(int, timestamp_match.groups())
             start_seconds = h * 3600 + m * 60 + s + ms / 1000
@@ -133,35 +183,71 @@ def _parse_srt_to_snippets(srt_content):
     return snippets
 
 
+def is_valid_video_id(video_id):
+    """
+    Check whether a string is a bare YouTube video ID.
+
+    A length check plus a set-containment scan, which is cheaper than a
+    regex match and rejects URLs on length alone.
+
+    Args:
+        video_id: Candidate video ID
+
+    Returns:
+        bool: True if it is exactly 11 URL-safe base64 characters
+    """
+    return len(video_id) == 11 and _VIDEO_ID_CHARS.issuperset(video_id)
+
+
 def extract_video_id(url_or_id):
     """
     Extract YouTube video ID from various URL formats.
 
+    Results are memoized per input string, since clients tend to resubmit
+    the same URL (reloads, history additions). Inputs longer than
+    _MAX_VIDEO_URL_LENGTH are rejected before the cache so arbitrary
+    request bodies cannot fill it.
+
     Args:
         url_or_id: YouTube URL or video ID
 
     Returns:
         Extracted 11-character video ID
 
+    Raises:
+        ValueError: If URL format is invalid or video ID cannot be extracted
+    """
+    if len(url_or_id) > _MAX_VIDEO_URL_LENGTH:
+        raise ValueError(
+            f"Could not extract video ID from input longer than {_MAX_VIDEO_URL_LENGTH} characters"
+        )
+
+    return _extract_video_id_cached(url_or_id)
+
+
+@lru_cache(maxsize=4096)
+def _extract_video_id_cached(url_or_id):
+    """
+    Memoized body of extract_video_id.
+
+    Failed extractions raise and are therefore never cached.
+
+    Args:
+        url_or_id: YouTube URL or video ID, already length-checked
+
+    Returns:
+        Extracted 11-character video ID
+
     Raises:
         ValueError: If URL format is invalid or video ID cannot be extracted
     """
     # If it's already a valid ID (11 characters, alphanumeric with dashes/underscores)
-    if re.match(r'^[a-zA-Z0-9_-]{11}$', url_or_id):
+    if is_valid_video_id(url_or_id):
         return url_or_id
 
-    # Regex patterns for various YouTube URL formats
-    patterns = [
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/watch\?v=([a-zA-Z0-9_-]{11})',
-        r'(?:https?:\/\/)?(?:www\.)?youtu\.be\/([a-zA-Z0-9_-]{11})',
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/embed\/([a-zA-Z0-9_-]{11})',
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/v\/([a-zA-Z0-9_-]{11})',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url_or_id)
-        if match:
-            return match.group(1)
+    match = _VIDEO_URL_RE.search(url_or_id)
+    if match:
+        return match.group(1)
 
     raise ValueError(f"Could not extract video ID from: {url_or_id}")
 
@@ -197,52 +283,32 @@ def fetch_transcript(video_id, language_codes=None):
         YouTubeRequestFailed: If YouTube request fails
     """
     # Validate video ID format (must be exactly 11 characters)
-    if not re.match(r'^[a-zA-Z0-9_-]{11}$', video_id):
+    if not is_valid_video_id(video_id):
         raise ValueError(f"Invalid YouTube video ID format: {video_id}")
 
     try:
-        # Create API instance
-        api = YouTubeTranscriptApi()
+        api = _get_transcript_api()
 
         # Fetch transcript
         if language_codes:
             # Try to get transcript in preferred languages
             transcript_list = api.list(video_id)
 
-            # Try manually created transcripts first
-            for lang_code in language_codes:
-                try:
-                    transcript = transcript_list.find_manually_created_transcript([lang_code])
-                    snippets = transcript.fetch()
-                    return _format_transcript_response(
-                        video_id=video_id,
-                        snippets=snippets,
-                        language=transcript.language,
-                        language_code=transcript.language_code,
-                        is_generated=False
-                    )
-                except NoTranscriptFound:
-                    continue
-
-            # Fall back to auto-generated transcripts
-            for lang_code in language_codes:
-                try:
-                    transcript = transcript_list.find_generated_transcript([lang_code])
-                    snippets = transcript.fetch()
-                    return _format_transcript_response(
-                        video_id=video_id,
-                        snippets=snippets,
-                        language=transcript.language,
-                        language_code=transcript.language_code,
-                        is_generated=True
-                    )
-                except NoTranscriptFound:
-                    continue
-
-            # If no preferred language found, raise error
-            raise NoTranscriptFound(
-                video_id,
-                f"No transcript found in requested languages: {language_codes}"
+            # Try manually created transcripts first, then fall back to
+            # auto-generated ones. Each lookup takes the whole priority list
+            # and raises NoTranscriptFound if no language matches.
+            try:
+                transcript = transcript_list.find_manually_created_transcript(language_codes)
+            except NoTranscriptFound:
+                transcript = transcript_list.find_generated_transcript(language_codes)
+
+            snippets = transcript.fetch()
+            return _format_transcript_response(
+                video_id=video_id,
+                snippets=snippets,
+                language=transcript.language,
+                language_code=transcript.language_code,
+                is_generated=transcript.is_generated
             )
         else:
             # Get any available transcript (default behavior)
@@ -264,13 +330,13 @@ def fetch_transcript(video_id, language_codes=None):
             logger.info(f"YouTube API fallback successful for {video_id}")
             return fallback_result
         raise TranscriptsDisabled(video_id)
-    except NoTranscriptFound as e:
+    except NoTranscriptFound:
         logger.warning(f"No transcript found for {video_id}, attempting YouTube API fallback")
         fallback_result = _fetch_transcript_youtube_api(video_id, language_codes)
         if fallback_result:
             logger.info(f"YouTube API fallback successful for {video_id}")
             return fallback_result
-        raise NoTranscriptFound(video_id, str(e))
+        raise
     except VideoUnavailable:
         raise VideoUnavailable(video_id)
     except YouTubeRequestFailed as e:
@@ -306,23 +372,17 @@ def _format_transcript_response(video_id, snippets, language, language_code, is_
     Returns:
         Formatted transcript response dict
     """
-    formatted_snippets = []
-    for snippet in snippets:
-        # Handle both dataclass objects and dictionaries
-        if hasattr(snippet, 'text'):
-            # It's a dataclass object
-            formatted_snippets.append({
-                "text": snippet.text,
-                "start": snippet.start,
-                "duration": snippet.duration
-            })
-        else:
-            # It's a dictionary
-            formatted_snippets.append({
-                "text": snippet["text"],
-                "start": snippet["start"],
-                "duration": snippet["duration"]
-            })
+    # All snippets in a response share one type, so check it once and pick
+    # the matching field getter
+    if snippets and hasattr(snippets[0], 'text'):
+        get_fields = _snippet_attrs  # FetchedTranscriptSnippet dataclasses
+    else:
+        get_fields = _snippet_items  # Dictionaries
+
+    formatted_snippets = [
+        {"text": text, "start": start, "duration": duration}
+        for text, start, duration in map(get_fields, snippets)
+    ]
 
     return {
         "videoId": video_id,
@@ -363,7 +423,7 @@ def get_available_transcripts(video_id):
         VideoUnavailable: If video doesn't exist
     """
     try:
-        api = YouTubeTranscriptApi()
+        api = _get_transcript_api()
         transcript_list = api.list(video_id)
 
         transcripts = []
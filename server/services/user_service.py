@@ -7,9 +7,13 @@ This module provides functions for CRUD-ish operations on the `User` model:
 """
 
 from datetime import datetime
+from sqlalchemy import bindparam, select
 from sqlalchemy.exc import IntegrityError
 from models import User
 
+# Built once and executed with a bound UID; skips per-call Query construction
+_USER_BY_FIREBASE_UID = select(User).where(User.firebase_uid == bindparam('firebase_uid'))
+
 
 def get_user_by_firebase_uid(firebase_uid: str, db):
     """
@@ -28,7 +32,9 @@ def get_user_by_firebase_uid(firebase_uid: str, db):
     if not firebase_uid:
         raise ValueError("firebase_uid is required")
 
-    return db.query(User).filter(User.firebase_uid == firebase_uid).first()
+    return db.execute(
+        _USER_BY_FIREBASE_UID, {'firebase_uid': firebase_uid}
+    ).scalar_one_or_none()
 
 
 def get_or_create_user(firebase_uid: str, email: str, display_name: str, db):
@@ -75,8 +81,8 @@ def get_or_create_user(firebase_uid: str, email: str, display_name: str, db):
     
     # before creating new user
     if email:
-        existing_user = db.query(User).filter(User.email == email).first()
-        if existing_user and existing_user.firebase_uid != firebase_uid:
+        existing_uid = db.query(User.firebase_uid).filter(User.email == email).scalar()
+        if existing_uid is not None and existing_uid != firebase_uid:
             raise ValueError("Email already in use by another account")
 
     # Create new user record
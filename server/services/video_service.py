@@ -3,16 +3,24 @@ Video service for LearnFlow.
 Handles video creation, caching, and metadata fetching.
 """
 
-import json
+import orjson
 import os
 from datetime import datetime
+from sqlalchemy import bindparam, func, select, update
 from sqlalchemy.exc import IntegrityError
 
 from models import Video, UserVideoProgress
+from utils.cache import metadata_cache, video_cache, video_duration_cache
+from utils.db_upsert import dialect_insert
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Lookups by YouTube ID, built once and executed with a bound ID to skip
+# per-call Query construction
+_VIDEO_BY_YOUTUBE_ID = select(Video).where(Video.youtube_video_id == bindparam('youtube_video_id'))
+_VIDEO_ID_BY_YOUTUBE_ID = select(Video.id).where(Video.youtube_video_id == bindparam('youtube_video_id'))
+
 
 def get_or_create_video(youtube_video_id, db):
     """
@@ -38,38 +46,63 @@ def get_or_create_video(youtube_video_id, db):
         raise ValueError(f"Invalid YouTube video ID: {youtube_video_id}")
 
     # Try to get existing video
-    video = db.query(Video).filter(
-        Video.youtube_video_id == youtube_video_id
-    ).first()
+    video = get_video_by_youtube_id(youtube_video_id, db)
 
     if video:
         return video
 
-    # Create new video entry with basic info
-    video = Video(
-        youtube_video_id=youtube_video_id,
-        title=f"Video {youtube_video_id}",  # Placeholder until metadata is fetched
-        duration_seconds=0,
-        total_views=0,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
+    # Create new video entry with basic info. Concurrent requests for the
+    # same new video can race here; on backends with native upsert support
+    # the losing INSERT becomes a no-op instead of a failed transaction.
+    now = datetime.utcnow()
+    values = {
+        "youtube_video_id": youtube_video_id,
+        "title": f"Video {youtube_video_id}",  # Placeholder until metadata is fetched
+        "duration_seconds": 0,
+        "total_views": 0,
+        "created_at": now,
+        "updated_at": now,
+    }
 
+    upsert = dialect_insert(db, Video)
     try:
-        db.add(video)
+        if upsert is not None:
+            db.execute(
+                upsert
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=[Video.youtube_video_id])
+            )
+        else:
+            db.add(Video(**values))
         db.commit()
-        db.refresh(video)
-        return video
     except IntegrityError:
         # Handle race condition: another request created the video
         db.rollback()
-        video = db.query(Video).filter(
-            Video.youtube_video_id == youtube_video_id
-        ).first()
-        if not video:
-            raise Exception("Failed to create or retrieve video")
-        return video
 
+    video = get_video_by_youtube_id(youtube_video_id, db)
+    if not video:
+        raise Exception("Failed to create or retrieve video")
+    return video
+
+
+def _commit_video_write(video, db):
+    """
+    Commit a write to a video row and drop its cached API payload and
+    duration.
+
+    The instance isn't refreshed: with the default session settings it
+    reloads lazily on next access, and sessions created with
+    expire_on_commit=False keep the values just written.
+
+    Args:
+        video: Modified Video model instance
+        db: Database session
+    """
+    video_id = video.id
+    youtube_video_id = video.youtube_video_id
+    db.commit()
+    video_cache.remove(youtube_video_id)
+    video_duration_cache.remove(video_id)
 
 
 def get_video_by_id(video_id, db):
@@ -83,7 +116,8 @@ def get_video_by_id(video_id, db):
     Returns:
         Video model instance or None
     """
-    return db.query(Video).filter(Video.id == video_id).first()
+    # Served from the session's identity map when already loaded
+    return db.get(Video, video_id)
 
 
 def get_video_by_youtube_id(youtube_video_id, db):
@@ -97,9 +131,28 @@ def get_video_by_youtube_id(youtube_video_id, db):
     Returns:
         Video model instance or None
     """
-    return db.query(Video).filter(
-        Video.youtube_video_id == youtube_video_id
-    ).first()
+    return db.execute(
+        _VIDEO_BY_YOUTUBE_ID, {'youtube_video_id': youtube_video_id}
+    ).scalar_one_or_none()
+
+
+def get_video_id_by_youtube_id(youtube_video_id, db):
+    """
+    Get a video's database ID by YouTube video ID.
+
+    Selects only the ID column, for callers that don't need the transcript
+    and cached JSON columns loaded with a full Video row.
+
+    Args:
+        youtube_video_id: YouTube video ID (11 characters)
+        db: Database session
+
+    Returns:
+        int or None: Database video ID
+    """
+    return db.execute(
+        _VIDEO_ID_BY_YOUTUBE_ID, {'youtube_video_id': youtube_video_id}
+    ).scalar_one_or_none()
 
 
 def cache_transcript(video_id, transcript_data, db):
@@ -122,18 +175,18 @@ def cache_transcript(video_id, transcript_data, db):
         raise ValueError(f"Video with ID {video_id} not found")
 
     # Store transcript as JSON string
-    video.transcript = json.dumps(transcript_data)
-    video.transcript_cached_at = datetime.utcnow()
+    now = datetime.utcnow()
+    video.transcript = orjson.dumps(transcript_data).decode()
+    video.transcript_cached_at = now
     video.language = transcript_data.get('languageCode', 'en')
 
     # Update duration if available
     if 'durationSeconds' in transcript_data:
         video.duration_seconds = transcript_data['durationSeconds']
 
-    video.updated_at = datetime.utcnow()
+    video.updated_at = now
 
-    db.commit()
-    db.refresh(video)
+    _commit_video_write(video, db)
     return video
 
 
@@ -156,11 +209,10 @@ def cache_checkpoints(video_id, checkpoints_data, db):
     if not video:
         raise ValueError(f"Video with ID {video_id} not found")
 
-    video.checkpoints_data = json.dumps(checkpoints_data)
+    video.checkpoints_data = orjson.dumps(checkpoints_data).decode()
     video.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(video)
+    _commit_video_write(video, db)
     return video
 
 
@@ -183,11 +235,10 @@ def cache_quiz(video_id, quiz_data, db):
     if not video:
         raise ValueError(f"Video with ID {video_id} not found")
 
-    video.quiz_data = json.dumps(quiz_data)
+    video.quiz_data = orjson.dumps(quiz_data).decode()
     video.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(video)
+    _commit_video_write(video, db)
     return video
 
 
@@ -213,8 +264,7 @@ def cache_summary(video_id, summary_text, db):
     video.summary = summary_text
     video.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(video)
+    _commit_video_write(video, db)
     return video
 
 
@@ -252,8 +302,7 @@ def update_video_metadata(video_id, title=None, description=None,
 
     video.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(video)
+    _commit_video_write(video, db)
     return video
 
 
@@ -288,35 +337,83 @@ def get_video_with_cache(youtube_video_id, db):
     Raises:
         ValueError: If video not found
     """
+    # Count the view and read back the fields it changes in one statement,
+    # so the row never has to be reloaded after the commit. updated_at is
+    # pinned so views don't register as content changes.
+    row = db.execute(
+        update(Video)
+        .where(Video.youtube_video_id == youtube_video_id)
+        .values(
+            total_views=func.coalesce(Video.total_views, 0) + 1,
+            updated_at=Video.updated_at,
+        )
+        .returning(Video.id, Video.created_at, Video.total_views, Video.updated_at)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+
+    if row is None:
+        video_cache.remove(youtube_video_id)
+        raise ValueError(f"Video with YouTube ID {youtube_video_id} not found")
+
+    cached = video_cache.get(youtube_video_id)
+    if cached is not None:
+        created_at = row.created_at.isoformat() + "Z" if row.created_at else None
+        updated_at = row.updated_at.isoformat() + "Z" if row.updated_at else None
+        # Only serve entries for the same row at the same revision. Writes
+        # in another worker process don't clear this process's cache, but
+        # they do bump updated_at, and recreated rows get a new id.
+        if (row.id == cached["id"] and created_at == cached["createdAt"]
+                and updated_at == cached["updatedAt"]):
+            return {**cached, "totalViews": row.total_views}
+        video_cache.remove(youtube_video_id)
+
     video = get_video_by_youtube_id(youtube_video_id, db)
     if not video:
         raise ValueError(f"Video with YouTube ID {youtube_video_id} not found")
 
-    # Increment view count
-    video.total_views = (video.total_views or 0) + 1
-    db.commit()
+    video_data = serialize_video(video)
+    video_cache.set(youtube_video_id, video_data)
+    return dict(video_data)
 
-    # Parse JSON fields
-    transcript = None
-    if video.transcript:
-        try:
-            transcript = json.loads(video.transcript)
-        except json.JSONDecodeError:
-            transcript = None
-
-    checkpoints = None
-    if video.checkpoints_data:
-        try:
-            checkpoints = json.loads(video.checkpoints_data)
-        except json.JSONDecodeError:
-            checkpoints = None
-
-    quiz = None
-    if video.quiz_data:
-        try:
-            quiz = json.loads(video.quiz_data)
-        except json.JSONDecodeError:
-            quiz = None
+
+def _parse_cached_json(raw):
+    """
+    Parse a cached JSON column value.
+
+    Args:
+        raw: JSON string from a Video column (may be None)
+
+    Returns:
+        Parsed value, or None if missing or malformed
+    """
+    if not raw:
+        return None
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def serialize_video(video, transcript=None):
+    """
+    Build the API representation of a video and its cached content.
+
+    Works purely from the in-memory model instance, so callers that already
+    hold an up-to-date Video (e.g. right after writing to it) don't need to
+    re-read it from the database.
+
+    Args:
+        video: Video model instance
+        transcript: Already-parsed transcript dict (optional). If None, the
+            cached transcript column is parsed instead.
+
+    Returns:
+        Dictionary with video data and cached content (same shape as
+        get_video_with_cache)
+    """
+    if transcript is None:
+        transcript = _parse_cached_json(video.transcript)
 
     return {
         "id": video.id,
@@ -331,8 +428,8 @@ def get_video_with_cache(youtube_video_id, db):
         "updatedAt": video.updated_at.isoformat() + "Z" if video.updated_at else None,
         "transcript": transcript,
         "transcriptCachedAt": video.transcript_cached_at.isoformat() + "Z" if video.transcript_cached_at else None,
-        "checkpoints": checkpoints,
-        "quiz": quiz,
+        "checkpoints": _parse_cached_json(video.checkpoints_data),
+        "quiz": _parse_cached_json(video.quiz_data),
         "summary": video.summary
     }
 
@@ -419,6 +516,12 @@ def fetch_youtube_metadata(youtube_video_id):
     Raises:
         Exception: If all metadata fetch methods fail
     """
+    # Metadata rarely changes, so repeat lookups skip the upstream call.
+    # Callers annotate the returned dict, hence the copies.
+    cached = metadata_cache.get(youtube_video_id)
+    if cached is not None:
+        return dict(cached)
+
     # Try pytubefix first
     try:
         from pytubefix import YouTube
@@ -426,7 +529,7 @@ def fetch_youtube_metadata(youtube_video_id):
         url = f"https://www.youtube.com/watch?v={youtube_video_id}"
         yt = YouTube(url)
 
-        return {
+        metadata = {
             "title": yt.title,
             "description": yt.description or "",
             "thumbnailUrl": yt.thumbnail_url,
@@ -434,6 +537,8 @@ def fetch_youtube_metadata(youtube_video_id):
             "author": yt.author,
             "publishDate": yt.publish_date.isoformat() if yt.publish_date else None
         }
+        metadata_cache.set(youtube_video_id, metadata)
+        return dict(metadata)
     except ImportError:
         logger.warning("pytubefix library not installed, attempting YouTube API fallback for metadata")
     except Exception as e:
@@ -443,7 +548,8 @@ def fetch_youtube_metadata(youtube_video_id):
     metadata = _fetch_metadata_youtube_api(youtube_video_id)
     if metadata:
         logger.info(f"Successfully fetched metadata via YouTube API for {youtube_video_id}")
-        return metadata
+        metadata_cache.set(youtube_video_id, metadata)
+        return dict(metadata)
     
     logger.error(f"Failed to fetch YouTube metadata for {youtube_video_id} using all available methods")
     raise Exception(f"Failed to fetch YouTube metadata for {youtube_video_id} using all available methods")
@@ -473,23 +579,33 @@ def get_user_video_history(user_id, db, limit=50):
             ...
         ]
     """
-    # Query UserVideoProgress records ordered by last_watched_at (most recent first)
-    progress_records = db.query(UserVideoProgress).filter(
+    # Query progress joined to its video, most recently watched first. One
+    # query with just the listed columns, rather than lazy-loading each full
+    # Video row (and its cached transcript/content) per record.
+    rows = db.query(
+        Video.youtube_video_id,
+        Video.title,
+        Video.thumbnail_url,
+        UserVideoProgress.last_position_seconds,
+        UserVideoProgress.last_watched_at,
+        UserVideoProgress.is_completed,
+        UserVideoProgress.watch_count
+    ).join(
+        Video, Video.id == UserVideoProgress.video_id
+    ).filter(
         UserVideoProgress.user_id == user_id
     ).order_by(UserVideoProgress.last_watched_at.desc()).limit(limit).all()
 
     history = []
-    for record in progress_records:
-        video = record.video
-
+    for row in rows:
         history.append({
-            'videoId': video.youtube_video_id,
-            'title': video.title,
-            'thumbnailUrl': video.thumbnail_url or f"https://img.youtube.com/vi/{video.youtube_video_id}/mqdefault.jpg",
-            'lastPositionSeconds': record.last_position_seconds,
-            'lastWatchedAt': record.last_watched_at.isoformat() + 'Z' if record.last_watched_at else None,
-            'isCompleted': record.is_completed,
-            'watchCount': record.watch_count
+            'videoId': row.youtube_video_id,
+            'title': row.title,
+            'thumbnailUrl': row.thumbnail_url or f"https://img.youtube.com/vi/{row.youtube_video_id}/mqdefault.jpg",
+            'lastPositionSeconds': row.last_position_seconds,
+            'lastWatchedAt': row.last_watched_at.isoformat() + 'Z' if row.last_watched_at else None,
+            'isCompleted': row.is_completed,
+            'watchCount': row.watch_count
         })
 
     return history
@@ -519,51 +635,49 @@ def save_video_to_history(user_id, youtube_video_id, last_position_seconds, is_c
         }
     """
     try:
-        # Get or create video record
-        video = get_or_create_video(youtube_video_id, db)
-
-        # Check if progress record exists
-        progress = db.query(UserVideoProgress).filter(
-            UserVideoProgress.user_id == user_id,
-            UserVideoProgress.video_id == video.id
-        ).first()
+        # Only the video's ID is needed, so skip loading the full row
+        # unless the video has to be created
+        video_id = get_video_id_by_youtube_id(youtube_video_id, db)
+        if video_id is None:
+            video_id = get_or_create_video(youtube_video_id, db).id
 
         now = datetime.utcnow()
 
-        if progress:
-            # Update existing record atomically
-            db.query(UserVideoProgress).filter(
-                UserVideoProgress.user_id == user_id,
-                UserVideoProgress.video_id == video.id
-            ).update(
-                {
-                    UserVideoProgress.last_position_seconds: last_position_seconds,
-                    UserVideoProgress.is_completed: is_completed,
-                    UserVideoProgress.last_watched_at: now,
-                    UserVideoProgress.watch_count: UserVideoProgress.watch_count + 1,
-                },
-                synchronize_session=False
-            )
-        else:
-            # Create new progress record
-            progress = UserVideoProgress(
+        upsert = dialect_insert(db, UserVideoProgress)
+        if upsert is not None:
+            # Create or update the progress row in a single statement,
+            # counting a repeat save as another watch
+            table = UserVideoProgress.__table__
+            stmt = upsert.values(
                 user_id=user_id,
-                video_id=video.id,
+                video_id=video_id,
                 last_position_seconds=last_position_seconds,
                 is_completed=is_completed,
                 first_watched_at=now,
                 last_watched_at=now,
                 watch_count=1
             )
-            db.add(progress)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.video_id],
+                set_={
+                    'last_position_seconds': stmt.excluded.last_position_seconds,
+                    'is_completed': stmt.excluded.is_completed,
+                    'last_watched_at': stmt.excluded.last_watched_at,
+                    'watch_count': table.c.watch_count + 1
+                }
+            ).returning(
+                UserVideoProgress.last_position_seconds,
+                UserVideoProgress.last_watched_at,
+                UserVideoProgress.is_completed,
+                UserVideoProgress.watch_count
+            )
+            progress = db.execute(stmt).one()
+        else:
+            progress = _save_progress_orm(
+                user_id, video_id, last_position_seconds, is_completed, now, db
+            )
 
         db.commit()
-        
-        # Re-fetch the updated progress object
-        progress = db.query(UserVideoProgress).filter(
-            UserVideoProgress.user_id == user_id,
-            UserVideoProgress.video_id == video.id
-        ).first()
 
         return {
             'videoId': youtube_video_id,
@@ -579,6 +693,47 @@ def save_video_to_history(user_id, youtube_video_id, last_position_seconds, is_c
         return None
 
 
+def _save_progress_orm(user_id, video_id, last_position_seconds, is_completed, now, db):
+    """
+    Create or update a history entry through the ORM.
+
+    Used for backends without native upsert support. The caller commits.
+
+    Args:
+        user_id: Database user ID (integer)
+        video_id: Database video ID (integer)
+        last_position_seconds: Current playback position in seconds
+        is_completed: Whether video has been fully watched
+        now: Timestamp for the watch
+        db: Database session
+
+    Returns:
+        UserVideoProgress model instance with the saved values
+    """
+    progress = db.query(UserVideoProgress).filter(
+        UserVideoProgress.user_id == user_id,
+        UserVideoProgress.video_id == video_id
+    ).first()
+
+    if progress:
+        # Increment in SQL so concurrent saves aren't lost
+        progress.watch_count = UserVideoProgress.watch_count + 1
+    else:
+        progress = UserVideoProgress(
+            user_id=user_id,
+            video_id=video_id,
+            first_watched_at=now,
+            watch_count=1
+        )
+        db.add(progress)
+
+    progress.last_position_seconds = last_position_seconds
+    progress.is_completed = is_completed
+    progress.last_watched_at = now
+    db.flush()
+    return progress
+
+
 def delete_video_from_history(user_id, youtube_video_id, db):
     """
     Remove a specific video from user's watch history.
@@ -593,14 +748,14 @@ def delete_video_from_history(user_id, youtube_video_id, db):
     """
     try:
         # Get video
-        video = get_video_by_youtube_id(youtube_video_id, db)
-        if not video:
+        video_id = get_video_id_by_youtube_id(youtube_video_id, db)
+        if video_id is None:
             return False
 
         # Find and delete progress record
         progress = db.query(UserVideoProgress).filter(
             UserVideoProgress.user_id == user_id,
-            UserVideoProgress.video_id == video.id
+            UserVideoProgress.video_id == video_id
         ).first()
 
         if not progress:
@@ -0,0 +1,89 @@
+"""
+Tests for the in-memory SimpleCache.
+
+How to run:
+    cd server
+    pytest tests/test_cache.py -v
+"""
+
+import sys
+import threading
+from unittest.mock import patch
+
+from utils.cache import SimpleCache
+
+
+def test_expired_entries_are_dropped():
+    cache = SimpleCache(ttl=10)
+    with patch("utils.cache.time.time", return_value=1000):
+        cache.set("a", 1)
+    with patch("utils.cache.time.time", return_value=1011):
+        assert cache.get("a") is None
+    assert cache.size() == 0
+
+
+def test_max_size_evicts_least_recently_used():
+    cache = SimpleCache(ttl=3600, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.set("c", 3)
+
+    assert cache.size() == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_overwriting_a_key_does_not_evict():
+    cache = SimpleCache(ttl=3600, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+
+    assert cache.size() == 2
+    assert cache.get("a") == 10
+    assert cache.get("b") == 2
+
+
+def test_stats_track_hits_and_misses():
+    cache = SimpleCache(ttl=3600)
+    assert cache.stats()["hitRate"] is None
+
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.stats() == {"size": 1, "hits": 2, "misses": 1, "hitRate": 0.6667}
+
+
+def test_concurrent_access_with_eviction():
+    cache = SimpleCache(ttl=3600, max_size=8)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(5000):
+                key = (i + offset) % 16
+                cache.set(key, i)
+                cache.get(key)
+                cache.remove((key + 1) % 16)
+        except Exception as e:
+            errors.append(e)
+
+    # Switch threads very often so get/set/remove interleave
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+    assert cache.size() <= 8
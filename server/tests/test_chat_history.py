@@ -134,6 +134,7 @@ class TestChatSendEndpoint:
             )
 
         assert response.status_code == 200
+        response.close()  # the turn is saved once the response is closed
         data = response.get_json()
         assert 'response' in data
         assert 'sessionId' in data
@@ -229,6 +230,7 @@ class TestChatSendEndpoint:
             )
 
         assert response.status_code == 200
+        response.close()  # the turn is saved once the response is closed
         data = response.get_json()
         assert 'response' in data
         assert 'sessionId' in data
@@ -260,6 +262,31 @@ class TestChatSendEndpoint:
         data = response.get_json()
         assert 'Video not found' in data['error']
 
+    @patch('routes.chat_routes.generate_chat_response')
+    def test_send_chat_llm_failure_saves_nothing(self, mock_generate, client, test_data, session):
+        """Test that a failed turn doesn't leave an unanswered user message."""
+        mock_generate.side_effect = Exception('LLM unavailable')
+
+        claims = {
+            'uid': test_data['user'].firebase_uid,
+            'email': test_data['user'].email,
+            'name': test_data['user'].display_name
+        }
+
+        with patch(VERIFY_PATCH_PATH, return_value=claims):
+            response = client.post(
+                '/api/llm/chat/send',
+                headers={'Authorization': 'Bearer faketoken'},
+                json={
+                    'videoId': test_data['video'].youtube_video_id,
+                    'message': 'Test question',
+                    'sessionId': 'failed-session'
+                }
+            )
+
+        assert response.status_code == 500
+        assert session.query(ChatMessage).filter_by(session_id='failed-session').count() == 0
+
 
 class TestChatHistoryEndpoint:
     """Tests for GET /api/llm/chat/history/<video_id> endpoint."""
@@ -421,6 +448,11 @@ class TestChatHistoryEndpoint:
         data = response.get_json()
         assert len(data['messages']) == 2
         assert data['totalMessages'] == 2
+        # The most recent messages are kept, still in chronological order
+        assert [m['message'] for m in data['messages']] == [
+            test_data['messages'][1].message,
+            test_data['messages'][2].message
+        ]
 
 
 class TestSessionIdGeneration:
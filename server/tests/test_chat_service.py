@@ -0,0 +1,75 @@
+"""
+Test suite for the chat service.
+
+Tests for:
+- Coalescing of small model chunks in generate_chat_response_stream
+- Transcript truncation for the chat system instruction
+
+How to run:
+    cd server
+    pytest tests/test_chat_service.py -v
+"""
+
+import pytest
+from unittest.mock import patch
+from services.chat_service import generate_chat_response_stream, _truncate_transcript
+
+pytestmark = pytest.mark.unit
+
+
+class TestChatStreamBatching:
+    """Test coalescing of small model chunks in the streaming service"""
+
+    @patch('services.chat_service.get_client')
+    def test_small_chunks_are_coalesced(self, mock_get_client):
+        """Tiny chunks are merged and the tail is flushed at the end"""
+        pieces = ['ab'] * 40 + ['end']
+        mock_get_client.return_value.generate_content_stream.return_value = iter(pieces)
+
+        chunks = list(generate_chat_response_stream(
+            'Explain this',
+            {},
+            min_chunk_chars=20,
+            max_flush_interval_ms=60000
+        ))
+
+        assert ''.join(chunks) == ''.join(pieces)
+        assert chunks[:4] == ['ab' * 10] * 4
+        assert chunks[-1] == 'end'
+
+
+class TestSystemInstructionTruncation:
+    """Test transcript truncation in the chat system instruction"""
+
+    def test_long_transcript_cut_at_sentence_end(self):
+        """Overlong transcripts are cut back to the last full sentence"""
+        transcript = ['First sentence.', 'Second one?', 'x' * 50]
+
+        text, is_truncated = _truncate_transcript(transcript, 40)
+
+        assert is_truncated
+        assert text == 'First sentence. Second one?'
+
+    def test_short_transcript_untouched(self):
+        """Transcripts within budget are returned whole"""
+        assert _truncate_transcript(['a', 'b'], 40) == ('a b', False)
+        assert _truncate_transcript('  plain text  ', 40) == ('plain text', False)
+
+    def test_exact_fill_is_not_truncated(self):
+        """Pieces that fill the budget exactly, spaces included, are kept whole"""
+        assert _truncate_transcript(['a' * 10, 'b' * 9], 20) == ('a' * 10 + ' ' + 'b' * 9, False)
+
+    def test_budget_one_short_counts_the_separator(self):
+        """The joining space counts against the budget and never overruns it"""
+        assert _truncate_transcript(['a' * 10, 'b' * 20], 10) == ('a' * 10, True)
+
+        text, is_truncated = _truncate_transcript(['a' * 10, 'b' * 9], 19)
+        assert is_truncated
+        assert text == 'a' * 10 + ' ' + 'b' * 8
+
+    def test_long_pieces_stay_within_budget(self):
+        """A large transcript never yields more than max_chars characters"""
+        text, is_truncated = _truncate_transcript(['x' * 12000, 'y' * 5000], 12000)
+
+        assert is_truncated
+        assert text == 'x' * 12000
@@ -0,0 +1,164 @@
+"""
+Test suite for the video progress service.
+
+Tests for:
+- get_user_progress listing with video details
+- get_user_progress for unknown users and users without progress
+- update_progress creation, completion and missing rows
+- mark_complete on new and existing progress
+- Cached video durations and their invalidation
+
+How to run:
+    cd server
+    pytest tests/test_progress_service.py -v
+"""
+
+import pytest
+from models import User, Video, UserVideoProgress
+from services import (
+    get_user_progress, get_video_progress, mark_complete, update_progress, update_video_metadata
+)
+from utils.cache import video_duration_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_duration_cache():
+    """Start each test with an empty duration cache."""
+    video_duration_cache.clear()
+    yield
+    video_duration_cache.clear()
+
+
+@pytest.fixture
+def user_with_progress(session):
+    """Create a user with progress on two videos."""
+    user = User(firebase_uid='progress-uid', email='progress@example.com')
+    watched = Video(youtube_video_id='aircAruvnKk', title='Neural networks', duration_seconds=1000)
+    unknown_length = Video(youtube_video_id='dQw4w9WgXcQ', title='Placeholder', duration_seconds=0)
+    session.add_all([user, watched, unknown_length])
+    session.flush()
+
+    session.add_all([
+        UserVideoProgress(user_id=user.id, video_id=watched.id, last_position_seconds=455, watch_count=2),
+        UserVideoProgress(user_id=user.id, video_id=unknown_length.id, last_position_seconds=30),
+    ])
+    session.commit()
+    return user
+
+
+def test_get_user_progress_includes_video_details(user_with_progress, session):
+    """Each record carries its YouTube ID and a capped completion percentage."""
+    progress = {p['youtubeVideoId']: p for p in get_user_progress(user_with_progress.id, session)}
+
+    assert set(progress) == {'aircAruvnKk', 'dQw4w9WgXcQ'}
+    assert progress['aircAruvnKk']['progressPercentage'] == 45.5
+    assert progress['aircAruvnKk']['watchCount'] == 2
+    assert progress['dQw4w9WgXcQ']['progressPercentage'] == 0.0
+
+
+def test_get_user_progress_unknown_user(session):
+    """Unknown users raise ValueError."""
+    with pytest.raises(ValueError):
+        get_user_progress(999999, session)
+
+
+def test_get_user_progress_empty(session):
+    """Users without progress get an empty list."""
+    user = User(firebase_uid='no-progress-uid', email='no-progress@example.com')
+    session.add(user)
+    session.commit()
+
+    assert get_user_progress(user.id, session) == []
+
+
+def test_update_progress_creates_and_completes(user_with_progress, session):
+    """First update creates progress; reaching 95% of the video completes it."""
+    video = session.query(Video).filter_by(youtube_video_id='aircAruvnKk').one()
+    other = Video(youtube_video_id='9bZkp7q19f0', title='Fresh', duration_seconds=200)
+    session.add(other)
+    session.commit()
+
+    started = update_progress(user_with_progress.id, other.id, 20, session)
+    assert started['lastPositionSeconds'] == 20
+    assert started['isCompleted'] is False
+    assert started['watchCount'] == 1
+
+    finished = update_progress(user_with_progress.id, video.id, 960, session)
+    assert finished['isCompleted'] is True
+    assert finished['watchCount'] == 2
+
+    rewound = update_progress(user_with_progress.id, video.id, 10, session)
+    assert rewound['lastPositionSeconds'] == 10
+    assert rewound['isCompleted'] is True
+
+
+def test_update_progress_unknown_user_or_video(user_with_progress, session):
+    """Missing users and videos are reported separately."""
+    video = session.query(Video).filter_by(youtube_video_id='aircAruvnKk').one()
+
+    with pytest.raises(ValueError, match='User'):
+        update_progress(999999, video.id, 10, session)
+    with pytest.raises(ValueError, match='Video'):
+        update_progress(user_with_progress.id, 999999, 10, session)
+
+
+def test_mark_complete_creates_and_persists(user_with_progress, session):
+    """Completing an unwatched video creates its progress in one commit."""
+    watched = session.query(Video).filter_by(youtube_video_id='aircAruvnKk').one()
+    other = Video(youtube_video_id='9bZkp7q19f0', title='Fresh', duration_seconds=200)
+    session.add(other)
+    session.commit()
+
+    created = mark_complete(user_with_progress.id, other.id, session)
+    assert created['isCompleted'] is True
+    assert created['lastPositionSeconds'] == 0
+    assert created['watchCount'] == 1
+    assert created['lastWatchedAt'] is not None
+
+    existing = mark_complete(user_with_progress.id, watched.id, session)
+    assert existing['lastPositionSeconds'] == 455
+
+    session.expire_all()
+    stored = session.query(UserVideoProgress).filter_by(
+        user_id=user_with_progress.id, video_id=other.id
+    ).one()
+    assert stored.is_completed is True
+    assert stored.first_watched_at == stored.last_watched_at
+
+
+def test_cached_duration_dropped_on_metadata_update(user_with_progress, session):
+    """Durations are cached after the first lookup and refreshed after a write."""
+    video = session.query(Video).filter_by(youtube_video_id='aircAruvnKk').one()
+
+    assert get_video_progress(user_with_progress.id, video.id, session)['progressPercentage'] == 45.5
+    assert video_duration_cache.get(video.id) == 1000
+
+    with pytest.raises(ValueError, match='User'):
+        update_progress(999999, video.id, 10, session)
+
+    update_video_metadata(video.id, duration_seconds=500, db=session)
+    assert video_duration_cache.get(video.id) is None
+    assert get_video_progress(user_with_progress.id, video.id, session)['progressPercentage'] == 91.0
+
+
+def test_unknown_duration_is_not_cached(user_with_progress, session):
+    """A 0 duration isn't cached, so completion works once the real one lands."""
+    video = session.query(Video).filter_by(youtube_video_id='dQw4w9WgXcQ').one()
+
+    update_progress(user_with_progress.id, video.id, 40, session)
+    assert video_duration_cache.get(video.id) is None
+
+    # Duration written outside this process, so no cache invalidation here
+    session.query(Video).filter_by(id=video.id).update({'duration_seconds': 40})
+    session.commit()
+
+    assert update_progress(user_with_progress.id, video.id, 40, session)['isCompleted'] is True
+    assert video_duration_cache.get(video.id) == 40
+
+
+def test_update_progress_checks_video_despite_cached_duration(user_with_progress, session):
+    """A cached duration doesn't stand in for the video existence check."""
+    video_duration_cache.set(999999, 100)
+
+    with pytest.raises(ValueError, match='Video'):
+        update_progress(user_with_progress.id, 999999, 10, session)
@@ -10,7 +10,7 @@ These are UNIT TESTS - they use Flask test client and don't require a running se
 import json
 import pytest
 from datetime import datetime, timezone
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from models import (
     User, Video, Quiz, Checkpoint,
@@ -247,6 +247,25 @@ class TestCheckpointGeneration:
         assert checkpoints[0].title == 'Test Checkpoint'
         assert checkpoints[0].time_seconds == 60
 
+    @patch('services.checkpoint_service.get_client')
+    def test_checkpoint_generation_rejects_non_json_reply(self, mock_get_client, client, session):
+        """A reply that isn't JSON is aborted while streaming and reported as a 400."""
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(["Sorry, I can't ", "help with that."])
+        mock_get_client.return_value.generate_content_stream.return_value = stream
+
+        response = client.post('/api/llm/checkpoints/generate', json={
+            'videoId': 'non-json-789',
+            'transcript': {
+                'snippets': [{'text': 'test', 'start': 0, 'duration': 1}],
+                'languageCode': 'en'
+            }
+        })
+
+        assert response.status_code == 400
+        assert 'Invalid checkpoint response format' in response.get_data(as_text=True)
+        stream.close.assert_called_once()
+
     def test_checkpoint_cache_returns_checkpoints_with_ids(self, client, test_data, session):
         """Test that cached checkpoints from database include IDs."""
         response = client.post('/api/llm/checkpoints/generate', json={
@@ -493,6 +512,28 @@ class TestCheckpointCompletion:
             assert data['isCompleted'] is True
             assert data['attemptCount'] == 2
 
+    def test_checkpoint_completion_keeps_first_completed_at(self, client, test_data, session):
+        """Test that answering again after completion only bumps the attempt count."""
+        checkpoint_id = test_data['checkpoints'][0].id
+        claims = {'uid': 'test-firebase-uid', 'email': 'test@example.com', 'name': 'Test User'}
+
+        with patch(VERIFY_PATCH_PATH, return_value=claims):
+            first = client.post(
+                f'/api/llm/checkpoints/{checkpoint_id}/complete',
+                headers={'Authorization': 'Bearer faketoken'},
+                json={'selectedAnswer': 'B'}
+            ).get_json()
+            second = client.post(
+                f'/api/llm/checkpoints/{checkpoint_id}/complete',
+                headers={'Authorization': 'Bearer faketoken'},
+                json={'selectedAnswer': 'A'}
+            ).get_json()
+
+        assert second['completionId'] == first['completionId']
+        assert second['isCompleted'] is True
+        assert second['attemptCount'] == 2
+        assert second['completedAt'] == first['completedAt']
+
     def test_checkpoint_completion_prevents_user_spoofing(self, client, test_data, session):
         """Test that endpoint uses authenticated user from token."""
         # Create another user
@@ -0,0 +1,276 @@
+"""
+Test suite for the Video management routes.
+
+Tests for:
+- GET /api/videos/{youtube_video_id}
+- GET /api/videos/{youtube_video_id}/metadata
+- POST /api/videos
+- POST /api/videos/transcript
+
+This file uses:
+- Flask test client
+- unittest.mock.patch to stub YouTube metadata/transcript fetching
+- SQLAlchemy session fixture from conftest.py for setup and cleanup
+
+How to run:
+    cd server
+    pytest tests/test_video_routes.py -v
+"""
+
+import json
+import zlib
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from app import app
+from models import Video
+from services import update_video_metadata
+from utils.cache import video_cache
+
+
+@pytest.fixture
+def client():
+    """Provide a Flask test client."""
+    app.testing = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def clear_video_cache():
+    """Start each test with an empty video cache."""
+    video_cache.clear()
+    yield
+    video_cache.clear()
+
+
+@pytest.fixture
+def video(session):
+    """Create a cached video row."""
+    video = Video(
+        youtube_video_id="aircAruvnKk",
+        title="But what is a neural network?",
+        duration_seconds=1140,
+    )
+    session.add(video)
+    session.commit()
+    return video
+
+
+@pytest.mark.parametrize("bad_id", ["short", "aircAruvnK!", "aircAruvnKk0"])
+def test_get_video_rejects_invalid_id(client, bad_id):
+    """IDs with the wrong length or charset are rejected before any DB lookup."""
+    response = client.get(f"/api/videos/{bad_id}")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid YouTube video ID format"
+
+
+def test_get_video_metadata_rejects_invalid_id(client):
+    """Metadata route applies the same ID validation."""
+    response = client.get("/api/videos/aircAruvn%3DK/metadata")
+
+    assert response.status_code == 400
+
+
+def test_get_video_not_found(client, session):
+    """Well-formed but unknown IDs return 404."""
+    response = client.get("/api/videos/dQw4w9WgXcQ")
+
+    assert response.status_code == 404
+
+
+def test_get_video_success(client, video):
+    """Cached video data is returned for a known ID."""
+    response = client.get("/api/videos/aircAruvnKk")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["youtubeVideoId"] == "aircAruvnKk"
+    assert data["title"] == "But what is a neural network?"
+    assert data["durationSeconds"] == 1140
+
+
+def test_get_video_accepts_trailing_slash(client, video):
+    """Trailing slashes are matched directly rather than redirected."""
+    response = client.get("/api/videos/aircAruvnKk/")
+
+    assert response.status_code == 200
+
+
+def test_get_video_cache_hit_still_counts_views(client, video):
+    """Repeat GETs are served from the cache but keep totalViews accurate."""
+    first = client.get("/api/videos/aircAruvnKk").get_json()
+    second = client.get("/api/videos/aircAruvnKk").get_json()
+
+    assert video_cache.get("aircAruvnKk") is not None
+    assert first["totalViews"] == 1
+    assert second["totalViews"] == 2
+    assert second["title"] == first["title"]
+
+
+def test_get_video_cache_invalidated_on_update(client, video, session):
+    """Writes through the video service drop the cached payload."""
+    client.get("/api/videos/aircAruvnKk")
+
+    update_video_metadata(video.id, title="Gradient descent", db=session)
+
+    assert video_cache.get("aircAruvnKk") is None
+    assert client.get("/api/videos/aircAruvnKk").get_json()["title"] == "Gradient descent"
+
+
+def test_get_video_cache_refreshed_after_write_elsewhere(client, video, session):
+    """Entries older than the row are rebuilt, e.g. after another worker's write."""
+    etag = client.get("/api/videos/aircAruvnKk").headers["ETag"]
+
+    # Change the row without going through this process's cache invalidation
+    session.query(Video).filter_by(id=video.id).update({
+        "title": "Gradient descent",
+        "updated_at": video.updated_at + timedelta(seconds=1),
+    })
+    session.commit()
+    assert video_cache.get("aircAruvnKk") is not None
+
+    response = client.get("/api/videos/aircAruvnKk", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["title"] == "Gradient descent"
+    assert video_cache.get("aircAruvnKk")["title"] == "Gradient descent"
+
+
+def test_get_video_etag_revalidation(client, video, session):
+    """A matching If-None-Match gets a bodyless 304 until the video changes."""
+    etag = client.get("/api/videos/aircAruvnKk").headers["ETag"]
+
+    cached = client.get("/api/videos/aircAruvnKk", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert cached.headers["ETag"] == etag
+
+    update_video_metadata(video.id, title="Gradient descent", db=session)
+
+    changed = client.get("/api/videos/aircAruvnKk", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.get_json()["title"] == "Gradient descent"
+
+
+MOCK_METADATA = {
+    "title": "Never Gonna Give You Up",
+    "description": "Official video",
+    "thumbnailUrl": "https://i.ytimg.com/vi/dQw4w9WgXcQ/hq720.jpg",
+    "durationSeconds": 213,
+    "author": "Rick Astley",
+    "publishDate": "2009-10-25",
+}
+
+MOCK_TRANSCRIPT = {
+    "videoId": "dQw4w9WgXcQ",
+    "snippets": [{"text": "We're no strangers to love", "start": 18.0, "duration": 3.5}],
+    "language": "English",
+    "languageCode": "en",
+    "isGenerated": False,
+    "fetchedAt": "2025-01-20T10:30:00Z",
+}
+
+
+@patch("routes.video_routes.fetch_transcript", return_value=MOCK_TRANSCRIPT)
+@patch("routes.video_routes.fetch_youtube_metadata", return_value=MOCK_METADATA)
+def test_create_video_with_metadata_and_transcript(mock_metadata, mock_transcript, client, session):
+    """Created video response reflects freshly fetched metadata and transcript."""
+    response = client.post("/api/videos", json={
+        "videoId": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "fetchMetadata": True,
+        "fetchTranscript": True,
+    })
+
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data["youtubeVideoId"] == "dQw4w9WgXcQ"
+    assert data["title"] == "Never Gonna Give You Up"
+    assert data["durationSeconds"] == 213
+    assert data["transcript"] == MOCK_TRANSCRIPT
+    assert data["language"] == "en"
+    assert data["message"] == "Video created successfully"
+    assert "metadataWarning" not in data
+    assert "transcriptWarning" not in data
+
+    video = session.query(Video).filter_by(youtube_video_id="dQw4w9WgXcQ").one()
+    assert video.title == "Never Gonna Give You Up"
+    assert video.transcript is not None
+
+
+@patch("routes.video_routes.fetch_youtube_metadata", side_effect=Exception("boom"))
+def test_create_video_metadata_failure_is_a_warning(mock_metadata, client, session):
+    """Metadata fetch failures don't fail video creation."""
+    response = client.post("/api/videos", json={
+        "videoId": "dQw4w9WgXcQ",
+        "fetchMetadata": True,
+    })
+
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data["title"] == "Video dQw4w9WgXcQ"
+    assert data["metadataWarning"] == "Failed to fetch metadata: boom"
+
+
+@patch("routes.video_routes._FETCH_EXECUTOR")
+@patch("routes.video_routes.fetch_transcript", return_value=MOCK_TRANSCRIPT)
+@patch("routes.video_routes.fetch_youtube_metadata", return_value=MOCK_METADATA)
+def test_create_video_in_background(mock_metadata, mock_transcript, mock_executor, client, session):
+    """Background creation answers 202 right away and hydrates afterwards."""
+    response = client.post("/api/videos", json={
+        "videoId": "dQw4w9WgXcQ",
+        "fetchMetadata": True,
+        "fetchTranscript": True,
+        "background": True,
+    })
+
+    assert response.status_code == 202
+    data = response.get_json()
+    assert data["status"] == "hydrating"
+    assert data["statusUrl"] == "/api/videos/dQw4w9WgXcQ"
+    assert data["title"] == "Video dQw4w9WgXcQ"
+    mock_metadata.assert_not_called()
+
+    # Run the queued job inline
+    job, *args = mock_executor.submit.call_args.args
+    job(*args)
+
+    video = session.query(Video).filter_by(youtube_video_id="dQw4w9WgXcQ").one()
+    assert video.title == "Never Gonna Give You Up"
+    assert video.transcript is not None
+
+
+@patch("routes.video_routes.fetch_transcript")
+def test_get_transcript_streams_valid_json(mock_transcript, client):
+    """Streamed transcripts spanning several chunks parse as one document."""
+    snippets = [{"text": f"line {i}", "start": float(i), "duration": 1.0} for i in range(1201)]
+    mock_transcript.return_value = {**MOCK_TRANSCRIPT, "snippets": snippets}
+
+    response = client.post("/api/videos/transcript", json={"videoId": "dQw4w9WgXcQ"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    data = response.get_json()
+    assert data["videoId"] == "dQw4w9WgXcQ"
+    assert data["snippets"] == snippets
+    assert data["durationSeconds"] == 1201
+
+
+@patch("routes.video_routes.fetch_transcript")
+def test_get_transcript_is_compressed_when_accepted(mock_transcript, client):
+    """Clients that accept compression get a compressed transcript stream."""
+    snippets = [{"text": f"line {i}", "start": float(i), "duration": 1.0} for i in range(100)]
+    mock_transcript.return_value = {**MOCK_TRANSCRIPT, "snippets": snippets}
+
+    response = client.post(
+        "/api/videos/transcript",
+        json={"videoId": "dQw4w9WgXcQ"},
+        headers={"Accept-Encoding": "deflate"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "deflate"
+    data = json.loads(zlib.decompress(response.get_data()))
+    assert data["snippets"] == snippets
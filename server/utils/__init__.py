@@ -3,6 +3,8 @@ Utilities module for LearnFlow.
 Contains helper functions and classes.
 """
 
-from .cache import SimpleCache, checkpoint_cache, quiz_cache, summary_cache
+from .cache import (SimpleCache, checkpoint_cache, quiz_cache, summary_cache, video_cache,
+                    metadata_cache, video_duration_cache)
 
-__all__ = ['SimpleCache', 'checkpoint_cache', 'quiz_cache', 'summary_cache']
+__all__ = ['SimpleCache', 'checkpoint_cache', 'quiz_cache', 'summary_cache', 'video_cache',
+           'metadata_cache', 'video_duration_cache']
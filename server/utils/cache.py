@@ -3,23 +3,34 @@ Caching utilities for LearnFlow.
 Provides simple in-memory caching for various data types.
 """
 
+import threading
 import time
 
 
 class SimpleCache:
     """
     Simple in-memory cache with TTL (Time To Live) support.
+
+    Safe to share between threads: every read or change of the entries and
+    counters happens under one lock.
     """
 
-    def __init__(self, ttl=3600):
+    def __init__(self, ttl=3600, max_size=None):
         """
         Initialize cache.
 
         Args:
             ttl (int): Time to live in seconds. Default: 3600 (1 hour)
+            max_size (int): Maximum number of entries. When full, the least
+                recently used entry is evicted. Default: None (unbounded)
         """
         self.cache = {}
+        self._lock = threading.Lock()
         self.ttl = ttl
+        self.max_size = max_size
+        # Lookup counters for monitoring (see stats())
+        self.hits = 0
+        self.misses = 0
 
     def get(self, key):
         """
@@ -31,17 +42,23 @@ class SimpleCache:
         Returns:
             Any or None: Cached data or None if not found/expired
         """
-        cached = self.cache.get(key)
-
-        if cached:
-            # Check if cache is still valid
-            if time.time() - cached['timestamp'] < self.ttl:
-                return cached['data']
-            else:
-                # Remove expired cache
-                del self.cache[key]
-
-        return None
+        with self._lock:
+            cached = self.cache.get(key)
+
+            if cached:
+                # Check if cache is still valid
+                if time.time() - cached['timestamp'] < self.ttl:
+                    if self.max_size is not None:
+                        # Move to the end so eviction order tracks recency
+                        self.cache[key] = self.cache.pop(key)
+                    self.hits += 1
+                    return cached['data']
+                else:
+                    # Remove expired cache
+                    del self.cache[key]
+
+            self.misses += 1
+            return None
 
     def set(self, key, data):
         """
@@ -51,10 +68,17 @@ class SimpleCache:
             key (str): Cache key
             data (Any): Data to cache
         """
-        self.cache[key] = {
-            'data': data,
-            'timestamp': time.time()
-        }
+        with self._lock:
+            if self.max_size is not None:
+                self.cache.pop(key, None)
+                while len(self.cache) >= self.max_size:
+                    # Dicts keep insertion order, so the first key is the LRU one
+                    del self.cache[next(iter(self.cache))]
+
+            self.cache[key] = {
+                'data': data,
+                'timestamp': time.time()
+            }
 
     def clear(self):
         """
@@ -63,9 +87,10 @@ class SimpleCache:
         Returns:
             int: Number of items cleared
         """
-        count = len(self.cache)
-        self.cache.clear()
-        return count
+        with self._lock:
+            count = len(self.cache)
+            self.cache.clear()
+            return count
 
     def size(self):
         """
@@ -76,6 +101,24 @@ class SimpleCache:
         """
         return len(self.cache)
 
+    def stats(self):
+        """
+        Get cache size and lookup counters.
+
+        Returns:
+            dict: {"size": int, "hits": int, "misses": int, "hitRate": float or None}
+        """
+        with self._lock:
+            size, hits, misses = len(self.cache), self.hits, self.misses
+
+        lookups = hits + misses
+        return {
+            'size': size,
+            'hits': hits,
+            'misses': misses,
+            'hitRate': round(hits / lookups, 4) if lookups else None
+        }
+
     def remove(self, key):
         """
         Remove specific item from cache.
@@ -86,13 +129,14 @@ class SimpleCache:
         Returns:
             bool: True if item was removed, False if not found
         """
-        if key in self.cache:
-            del self.cache[key]
-            return True
-        return False
+        with self._lock:
+            return self.cache.pop(key, None) is not None
 
 
 # Global cache instances
 checkpoint_cache = SimpleCache(ttl=3600)  # 1 hour TTL
 quiz_cache = SimpleCache(ttl=3600)  # 1 hour TTL
 summary_cache = SimpleCache(ttl=3600)  # 1 hour TTL
+video_cache = SimpleCache(ttl=3600, max_size=256)  # Full payloads incl. transcripts, so kept small
+metadata_cache = SimpleCache(ttl=3600, max_size=10000)  # 1 hour TTL
+video_duration_cache = SimpleCache(ttl=3600, max_size=4096)  # Keyed by video database ID
@@ -0,0 +1,33 @@
+"""
+Database upsert helpers for LearnFlow.
+Picks the dialect-specific INSERT construct that supports ON CONFLICT.
+"""
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO NOTHING /
+# DO UPDATE
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+def dialect_insert(session, table):
+    """
+    Build an INSERT for table that supports ON CONFLICT clauses.
+
+    Args:
+        session: SQLAlchemy session whose bind decides the dialect
+        table: ORM model or Table to insert into
+
+    Returns:
+        Insert construct with on_conflict_do_nothing / on_conflict_do_update,
+        or None if the database dialect has no ON CONFLICT support (callers
+        then fall back to the ORM path)
+    """
+    insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if insert is None:
+        return None
+    return insert(table)
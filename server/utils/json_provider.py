@@ -0,0 +1,87 @@
+"""
+orjson-backed JSON provider for LearnFlow.
+
+Video and transcript payloads can carry thousands of transcript snippets,
+which the stdlib json encoder serializes in pure Python. This provider
+serializes with orjson instead and hands the bytes straight to the
+response without an extra encode step.
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes with orjson.
+
+    Keys are emitted in insertion order rather than sorted, and non-ASCII
+    text is written as UTF-8. Dates still go through Flask's default
+    handler so they keep the same HTTP date format as before.
+    """
+
+    sort_keys = False
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize data as a JSON string.
+
+        Args:
+            obj: Data to serialize
+            **kwargs: Accepted for API compatibility; only ``default`` is used
+
+        Returns:
+            str: JSON document
+        """
+        return self._dumps_bytes(obj, kwargs.get('default', self.default)).decode()
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize JSON from a string or UTF-8 bytes.
+
+        Args:
+            s: JSON document
+            **kwargs: Accepted for API compatibility and ignored
+
+        Returns:
+            Any: Parsed data
+        """
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Serialize arguments as JSON and wrap them in a response.
+
+        Args:
+            *args: A single value, or several values to serialize as a list
+            **kwargs: Treated as a dict to serialize
+
+        Returns:
+            Response: JSON response
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.options
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+
+        return self._app.response_class(
+            self._dumps_bytes(obj, self.default, option) + b'\n',
+            mimetype=self.mimetype
+        )
+
+    def _dumps_bytes(self, obj, default, option=None):
+        """
+        Serialize data to JSON bytes with orjson.
+
+        Args:
+            obj: Data to serialize
+            default: Fallback for types orjson doesn't handle natively
+            option: orjson option flags (default: the provider's options)
+
+        Returns:
+            bytes: UTF-8 JSON document
+        """
+        if option is None:
+            option = self.options
+        return orjson.dumps(obj, default=default, option=option)
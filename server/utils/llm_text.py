@@ -0,0 +1,42 @@
+"""
+Text helpers shared by the LLM generation services.
+Handles markdown fence stripping and MM:SS timestamp labels.
+"""
+
+import re
+
+# Opening/closing markdown fence around an LLM's JSON reply
+_FENCE_RE = re.compile(r'\A```[\w-]*[ \t]*\n?|\n?[ \t]*```\s*\Z')
+# MM:SS labels for every whole second in the first two hours
+_MMSS = [f"{s // 60:02d}:{s % 60:02d}" for s in range(2 * 60 * 60)]
+
+
+def strip_code_fence(text):
+    """
+    Remove a markdown code fence wrapped around an LLM reply.
+
+    Args:
+        text (str): Raw model output
+
+    Returns:
+        str: The stripped text without the opening/closing fence
+    """
+    return _FENCE_RE.sub('', text.strip())
+
+
+def seconds_to_mmss(seconds):
+    """
+    Convert seconds to MM:SS format.
+
+    Args:
+        seconds (float): Time in seconds
+
+    Returns:
+        str: Formatted time as MM:SS
+    """
+    if 0 <= seconds < len(_MMSS):
+        return _MMSS[int(seconds)]
+
+    minutes = int(seconds // 60)
+    secs = int(seconds % 60)
+    return f"{minutes:02d}:{secs:02d}"
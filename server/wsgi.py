@@ -0,0 +1,18 @@
+"""
+Production WSGI entry point for LearnFlow.
+
+Patches the standard library for gevent before anything else is imported,
+so blocking socket I/O in route handlers (YouTube, LLM and database calls)
+yields to other requests instead of tying up the worker.
+
+Run with:
+    gunicorn -k gevent -w 4 --worker-connections 500 wsgi:app
+"""
+
+from gevent import monkey
+
+monkey.patch_all()
+
+from app import app  # noqa: E402
+
+__all__ = ['app']